@@ -1,15 +1,33 @@
 import qcodes.validators as vals
 import logging
 
-from time import sleep
-from typing import Any, Optional
-from functools import partial
-from qcodes.instrument import InstrumentChannel, VisaInstrument
+from contextlib import contextmanager
+from collections.abc import Iterator
+from typing import Any
+from qcodes.instrument import (
+    ChannelList,
+    ChannelTuple,
+    InstrumentChannel,
+)
 from qcodes.parameters import Parameter
 from qcodes.validators import Ints, Numbers
 
+from ._arduino_dac import ArduinoDACBase
+
 log = logging.getLogger(__name__)
 
+_VALID_CHNLS = frozenset(f"ch{i}" for i in range(1, 5))
+
+# Shared by all instances, kept a plain dict so snapshots stay serializable
+_DISPLAY_MODE_MAP = {
+    "NORMAL": 0,
+    "FOCUS1": 1,
+    "FOCUS2": 2,
+    "FOCUS3": 3,
+    "FOCUS4": 4,
+    "REMOTE": 5,
+}
+
 
 class ACDAC9106Channel(InstrumentChannel):
     """
@@ -25,21 +43,26 @@ class ACDAC9106Channel(InstrumentChannel):
             channel: The name used by the DAC, i.e. either
                 'ch1', 'ch2', 'ch3', or 'ch4'
         """
-        valid_chnls = [f"ch{i}" for i in range(1, 9)]
-        if channel not in valid_chnls:
-            raise ValueError(f"{channel} not in ch1, ..., ch8")
+        if channel not in _VALID_CHNLS:
+            raise ValueError(f"{channel} not in ch1, ..., ch4")
 
         super().__init__(parent, name)
         self.channel = f"CHAN{channel[-1]}"
         self._extra_visa_timeout = 5000
+        # fixed command strings, built once rather than on every call; the
+        # set commands are bound formats, also used for batched writes
+        self._volt_get = f"{self.channel}:VOLTAGE?"
+        self._voltage_cmd = f"{self.channel}:VOLTAGE {{}}".format
+        self._phase_get = f"{self.channel}:PHASE?"
+        self._phase_cmd = f"{self.channel}:PHASE {{}}".format
 
         self.voltage: Parameter = self.add_parameter(
             name="voltage",
             unit="mV",
             label="Voltage",
             get_parser=float,
-            get_cmd=partial(self._get_set_voltage),
-            set_cmd=partial(self._get_set_voltage),
+            get_cmd=self._get_voltage,
+            set_cmd=self._set_voltage,
             vals=Numbers(0, 450),
         )
         "Voltage level parameter"
@@ -49,27 +72,51 @@ class ACDAC9106Channel(InstrumentChannel):
             unit="deg",
             label="Phase",
             get_parser=float,
-            get_cmd=f"{self.channel}:PHASE?",
-            set_cmd=f"{self.channel}:PHASE {{}};PAT:UPDATE",
+            get_cmd=self._phase_get,
+            set_cmd=self._set_phase,
             vals=Numbers(-180, 180),
         )
         "Phase parameter"
 
-    def _get_set_voltage(self, voltage: Optional[float] = None) -> Optional[float]:
+    def _get_voltage(self) -> str:
+        """
+        Get the voltage level.
+        """
+        return self.ask(self._volt_get)
+
+    def _set_voltage(self, voltage: float) -> None:
+        """
+        Set the voltage level.
+
+        Args:
+            voltage: The voltage level to set
+        """
+        self._write_update(self._voltage_cmd(voltage))
+
+    def _set_phase(self, phase: float) -> None:
         """
-        Get or set the voltage level.
+        Set the phase.
 
         Args:
-            voltage: If missing, we assume that we are getting the
-            current level. Else we are setting it
+            phase: The phase to set
         """
-        if voltage is not None:
-            self.write(f"{self.channel}:VOLTAGE {voltage};PAT:UPDATE")
+        self._write_update(self._phase_cmd(phase))
+
+    def _write_update(self, cmd: str) -> None:
+        """
+        Write a command followed by a pattern update, unless updates are
+        deferred (see ACDAC9106.deferred_update).
+
+        Args:
+            cmd: The command to write
+        """
+        if self._parent._defer_update:
+            self.write(cmd)
         else:
-            return self.ask(f"{self.channel}:VOLTAGE?")
+            self.write(cmd + ";PAT:UPDATE")
 
 
-class ACDAC9106(VisaInstrument):
+class ACDAC9106(ArduinoDACBase):
     """
     QCoDeS driver for custom made DC-DAC AD55706 DC generator
     Args:
@@ -83,13 +130,17 @@ class ACDAC9106(VisaInstrument):
         self, name: str, address: str, terminator: str = "\n", **kwargs: Any
     ) -> None:
         super().__init__(name, address, terminator=terminator, **kwargs)
+        self._defer_update = False
 
-        self.channels: list[ACDAC9106Channel] = []
+        channels = ChannelList(self, "channels", ACDAC9106Channel, snapshotable=False)
         for ch in range(1, 5):
             ch_name = f"ch{ch}"
             channel = ACDAC9106Channel(self, ch_name, ch_name)
             self.add_submodule(ch_name, channel)
-            self.channels.append(channel)
+            channels.append(channel)
+        self.channels: ChannelTuple[ACDAC9106Channel] = self.add_submodule(
+            "channels", channels.to_channel_tuple()
+        )
 
         self.frequency: Parameter = self.add_parameter(
             name="frequency",
@@ -102,7 +153,12 @@ class ACDAC9106(VisaInstrument):
         )
 
         self.error: Parameter = self.add_parameter(
-            name="error", label="Error", get_cmd="SYS:ERR?", set_cmd=False
+            name="error",
+            label="Error",
+            get_cmd="SYS:ERR?",
+            set_cmd=False,
+            # reading pops the error queue, so never do it for a snapshot
+            snapshot_get=False,
         )
 
         self.display_mode: Parameter = self.add_parameter(
@@ -110,18 +166,12 @@ class ACDAC9106(VisaInstrument):
             label="Display Mode",
             get_cmd=False,
             set_cmd=f"SYS:DISP:MODE {{}}",
-            val_mapping={
-                "NORMAL": 0,
-                "FOCUS1": 1,
-                "FOCUS2": 2,
-                "FOCUS3": 3,
-                "FOCUS4": 4,
-                "REMOTE": 5,
-            },
+            snapshot_get=False,
+            val_mapping=_DISPLAY_MODE_MAP,
         )
 
-        # Required as Arduino takes around 2 seconds to setup serial
-        sleep(3)
+        # Arduino takes around 2 seconds to setup serial
+        self._wait_ready()
         self.connect_message()
 
         # Set to remote access mode by default
@@ -133,5 +183,98 @@ class ACDAC9106(VisaInstrument):
         """
         self.write("*RST")
         self.display_mode("REMOTE")
-        log.debug("Reset Instrument. Re-querying settings...")
-        self.snapshot(update=True)
+        for ch in self.channels:
+            ch.voltage.cache.invalidate()
+            ch.phase.cache.invalidate()
+        self.frequency.cache.invalidate()
+        log.debug("Reset Instrument. Settings will be re-read on next access.")
+
+    def refresh(self) -> None:
+        """
+        Re-read voltage and phase of all channels and the frequency with a
+        single query
+        """
+        self._get_status()
+
+    @contextmanager
+    def deferred_update(self) -> Iterator[None]:
+        """
+        Skip the pattern update after each voltage/phase write within the
+        context and update the pattern once on exit, e.g.
+
+            with acdac.deferred_update():
+                acdac.ch1.voltage(100)
+                acdac.ch2.phase(90)
+        """
+        deferred = self._defer_update
+        self._defer_update = True
+        try:
+            yield
+        finally:
+            self._defer_update = deferred
+            if not deferred:
+                self.write("PAT:UPDATE")
+
+    def set_voltages(self, voltages: dict[int, float]) -> None:
+        """
+        Set the voltage level of several channels with a single write and at
+        most one pattern update. Nothing is read back, use refresh() to verify.
+
+        Args:
+            voltages: Mapping of channel number (1-4) to voltage level
+        """
+        self._set_channels("voltage", "_voltage_cmd", voltages)
+
+    def set_phases(self, phases: dict[int, float]) -> None:
+        """
+        Set the phase of several channels with a single write and at most one
+        pattern update. Nothing is read back, use refresh() to verify.
+
+        Args:
+            phases: Mapping of channel number (1-4) to phase
+        """
+        self._set_channels("phase", "_phase_cmd", phases)
+
+    def _set_channels(self, name: str, cmd: str, values: dict[int, float]) -> None:
+        """
+        Validate and set a parameter on several channels with one write.
+
+        Args:
+            name: Name of the channel parameter, e.g. 'voltage'
+            cmd: Name of the channel's bound set command, e.g.
+                '_voltage_cmd'
+            values: Mapping of channel number (1-4) to value
+        """
+        # a bare PAT:UPDATE is not worth a write
+        if not values:
+            return
+        params = []
+        for num, value in values.items():
+            if not 1 <= num <= len(self.channels):
+                raise ValueError(f"Channel number {num} not in 1, ..., 4")
+            ch = self.channels[num - 1]
+            param = ch.parameters[name]
+            param.validate(value)
+            params.append((getattr(ch, cmd)(value), param, value))
+
+        cmds = [set_cmd for set_cmd, _, _ in params]
+        if not self._defer_update:
+            cmds.append("PAT:UPDATE")
+        self.write(";".join(cmds))
+        for _, param, value in params:
+            param.cache.set(value)
+
+    def _get_status(self) -> None:
+        """
+        Read voltage and phase of every channel plus the frequency with one
+        compound query and store the results in the parameter caches.
+        """
+        params = []
+        for ch in self.channels:
+            params.append((ch.voltage, ch._volt_get))
+            params.append((ch.phase, ch._phase_get))
+        params.append((self.frequency, "FREQ?"))
+
+        resps = self._ask_many([query for _, query in params])
+        for (param, _), resp in zip(params, resps):
+            param.cache.set(float(resp))
@@ -1,16 +1,25 @@
 import qcodes.validators as vals
 import logging
+import numpy as np
 
-from time import sleep
-from typing import Any, Optional
-from functools import partial
-from qcodes.instrument import InstrumentChannel, VisaInstrument
+from threading import Lock
+from time import monotonic, sleep
+from collections.abc import Mapping, Sequence
+from typing import Any, Optional, Union
+from qcodes.instrument import (
+    ChannelList,
+    ChannelTuple,
+    InstrumentChannel,
+)
 from qcodes.parameters import Parameter
 from qcodes.validators import Ints, Numbers
 
+from ._arduino_dac import ArduinoDACBase
 
 log = logging.getLogger(__name__)
 
+_VALID_CHNLS = frozenset(f"channel{i}" for i in range(1, 9))
+
 
 class DCDAC5764Channel(InstrumentChannel):
     """
@@ -26,21 +35,28 @@ class DCDAC5764Channel(InstrumentChannel):
             channel: The name used by the DCDAC, i.e. either
                 'channel1', 'channel2', ..., 'channel8'
         """
-        valid_chnls = [f"channel{i}" for i in range(1, 9)]
-        if channel not in valid_chnls:
+        if channel not in _VALID_CHNLS:
             raise ValueError(f"{channel} not in channel1, ..., channel8")
 
         super().__init__(parent, name)
         self.channel = channel
         self._extra_visa_timeout = 5000
+        # fixed command strings, built once rather than on every call
+        self._volt_get = f"{channel}:VOLTAGE?"
+        # bound format of the set command, also used for batched writes;
+        # fixed-point so small levels are never sent in exponent notation
+        self._voltage_cmd = f"{channel}:VOLTAGE {{:.6f}}".format
+        # a voltage set less than _voltage_ttl seconds ago is read from cache
+        self._voltage_ttl = 0.5
+        self._set_time: Optional[float] = None
 
         self.voltage: Parameter = self.add_parameter(
             name="voltage",
             unit="V",
             label="Voltage",
             get_parser=float,
-            get_cmd=partial(self._get_set_voltage),
-            set_cmd=partial(self._get_set_voltage),
+            get_cmd=self._get_voltage,
+            set_cmd=self._set_voltage,
             vals=Numbers(-10, 10),
         )
         "Voltage level parameter"
@@ -50,6 +66,7 @@ class DCDAC5764Channel(InstrumentChannel):
             label="Offset",
             get_cmd=False,
             set_cmd=f"{self.channel}:OFFSET {{}}",
+            snapshot_get=False,
             # signed 8 bit integer
             vals=Ints(-128, 127),
         )
@@ -60,26 +77,80 @@ class DCDAC5764Channel(InstrumentChannel):
             label="Step",
             get_cmd=False,
             set_cmd=f"{self.channel}:STEP {{}}",
+            snapshot_get=False,
             # signed 6 bit integer
             vals=Ints(-32, 31),
         )
         "Step size settable parameter"
 
-    def _get_set_voltage(self, voltage: Optional[float] = None) -> Optional[float]:
+    def _get_voltage(self) -> str:
+        """
+        Get the voltage level. A level set within the last _voltage_ttl
+        seconds is returned without querying the DAC.
+        """
+        if (
+            self._set_time is not None
+            and monotonic() - self._set_time < self._voltage_ttl
+        ):
+            return str(self.voltage.cache.raw_value)
+        return self.ask(self._volt_get)
+
+    def _set_voltage(self, voltage: float) -> None:
+        """
+        Set the voltage level.
+
+        Args:
+            voltage: The voltage level to set
         """
-        Get or set the voltage level.
+        # the old level must not be served from cache while the write is
+        # in flight
+        self._set_time = None
+        self.write(self._voltage_cmd(voltage))
+        # qcodes only updates the cache after set_cmd returns, so fill it
+        # here before the level counts as known
+        self._voltage_known(voltage)
+
+    def sweep(self, points: Sequence[float], dwell: float = 0.0) -> None:
+        """
+        Step the voltage through a list of levels. All levels are validated
+        and formatted before the first one is written, and the steps are
+        paced against fixed deadlines so per-write overhead does not add
+        to the dwell time.
 
         Args:
-            voltage: If missing, we assume that we are getting the
-            current level. Else we are setting it
+            points: The voltage levels to step through, in order
+            dwell: The time to stay at each level in seconds
         """
-        if voltage is not None:
-            self.write(f"{self.channel}:VOLTAGE {voltage}")
-        else:
-            return self.ask(f"{self.channel}:VOLTAGE?")
+        points = np.asarray(points, dtype=float)
+        if points.size == 0:
+            return
+        # the extremes are enough to validate a range check
+        self.voltage.validate(float(points.min()))
+        self.voltage.validate(float(points.max()))
 
+        cmds = [self._voltage_cmd(point) for point in points.tolist()]
+        self._set_time = None
+        start = monotonic()
+        for i, cmd in enumerate(cmds):
+            if i > 0:
+                slack = start + i * dwell - monotonic()
+                if slack > 0:
+                    sleep(slack)
+            self.write(cmd)
+        self._voltage_known(float(points[-1]))
 
-class DCDAC5764(VisaInstrument):
+    def _voltage_known(self, voltage: float) -> None:
+        """
+        Record a voltage level written outside of the voltage parameter.
+
+        Args:
+            voltage: The voltage level now on the channel
+        """
+        self.voltage.cache.set(voltage)
+        self._set_time = monotonic()
+
+
+class DCDAC5764(ArduinoDACBase):
     """
     QCoDeS driver for custom made DC-DAC AD55706 DC generator
     Args:
@@ -92,27 +163,113 @@ class DCDAC5764(VisaInstrument):
     def __init__(
         self, name: str, address: str, terminator: str = "\n", **kwargs: Any
     ) -> None:
+        # serialises bus access so channels can be used from several threads
+        self._lock = Lock()
+        # whether anything was written since the last reset; the state left
+        # by a previous session is unknown, so start out dirty
+        self._dirty = True
         super().__init__(name, address, terminator=terminator, **kwargs)
 
-        self.channels: list[DCDAC5764Channel] = []
+        channels = ChannelList(self, "channels", DCDAC5764Channel, snapshotable=False)
         for ch in range(1, 9):
             ch_name = f"channel{ch}"
             channel = DCDAC5764Channel(self, ch_name, ch_name)
             self.add_submodule(ch_name, channel)
-            self.channels.append(channel)
+            channels.append(channel)
+        self.channels: ChannelTuple[DCDAC5764Channel] = self.add_submodule(
+            "channels", channels.to_channel_tuple()
+        )
 
-        # Required as Arduino takes around 2 seconds to setup serial
-        sleep(3)
+        # Arduino takes around 2 seconds to setup serial
+        self._wait_ready()
         self.connect_message()
 
-    def reset(self) -> None:
+    def write_raw(self, cmd: str) -> None:
+        with self._lock:
+            self._dirty = True
+            super().write_raw(cmd)
+
+    def ask_raw(self, cmd: str) -> str:
+        # hold the lock across write and read so responses cannot interleave
+        with self._lock:
+            return super().ask_raw(cmd)
+
+    def reset(self, force: bool = False) -> None:
         """
         Reset DAC to 0V on each channel, and sets offsets/steps to 0
+
+        Args:
+            force: Reset even if nothing was written since the last reset
         """
+        if not (force or self._dirty):
+            return
         self.write("*RST")
-        for channel_num in range(8):
-            inst_chnl = self.channels[channel_num]
-            inst_chnl.offset(0)
-            inst_chnl.step(0)
-        log.debug("Reset Instrument. Re-querying settings...")
-        self.snapshot(update=True)
+        cmds = []
+        for ch in self.channels:
+            cmds.append(f"{ch.channel}:OFFSET 0")
+            cmds.append(f"{ch.channel}:STEP 0")
+        self.write(";".join(cmds))
+        for ch in self.channels:
+            ch._voltage_known(0)
+            ch.offset.cache.set(0)
+            ch.step.cache.set(0)
+        self._dirty = False
+        log.debug("Reset Instrument.")
+
+    def refresh(self) -> None:
+        """
+        Re-read the voltage of all channels with a single query
+        """
+        self._get_status()
+
+    def get_voltages(self) -> np.ndarray:
+        """
+        Read the voltage of all channels with a single query
+
+        Returns:
+            The voltage levels of channel 1 to 8
+        """
+        return np.array(self._get_status())
+
+    def set_voltages(
+        self, voltages: Union[Mapping[int, float], Sequence[float]]
+    ) -> None:
+        """
+        Set the voltage level of several channels with a single write.
+
+        Args:
+            voltages: Mapping of channel number (1-8) to voltage level, or a
+                sequence of voltage levels starting at channel 1
+        """
+        if not isinstance(voltages, Mapping):
+            voltages = dict(enumerate(voltages, 1))
+        # an empty write would only be answered with an error
+        if not voltages:
+            return
+        channels = []
+        for num, voltage in voltages.items():
+            if not 1 <= num <= len(self.channels):
+                raise ValueError(f"Channel number {num} not in 1, ..., 8")
+            ch = self.channels[num - 1]
+            ch.voltage.validate(voltage)
+            channels.append((ch, voltage))
+
+        for ch, _ in channels:
+            ch._set_time = None
+        self.write(";".join(ch._voltage_cmd(voltage) for ch, voltage in channels))
+        for ch, voltage in channels:
+            ch._voltage_known(voltage)
+
+    def _get_status(self) -> list[float]:
+        """
+        Read the voltage of every channel with one compound query and store
+        the results in the channel parameter caches.
+
+        Returns:
+            The voltage levels of channel 1 to 8
+        """
+        resps = self._ask_many([ch._volt_get for ch in self.channels])
+        voltages = [float(resp) for resp in resps]
+        for ch, voltage in zip(self.channels, voltages):
+            ch.voltage.cache.set(voltage)
+        return voltages
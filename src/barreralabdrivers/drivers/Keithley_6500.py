@@ -1,11 +1,48 @@
+import logging
+from contextlib import contextmanager
 from functools import partial
-from typing import Any, Callable, TypeVar, Union
-
-from qcodes.instrument import VisaInstrument
+from time import monotonic
+from collections.abc import Iterator, Sequence
+from typing import Any, Callable, Optional, TypeVar, Union
+
+import numpy as np
+from pyvisa.errors import VisaIOError
+from qcodes.instrument import ChannelList, InstrumentChannel, VisaInstrument
+from qcodes.parameters import Parameter
 from qcodes.validators import Bool, Enum, Ints, MultiType, Numbers
 
 T = TypeVar("T")
 
+log = logging.getLogger(__name__)
+
+# Abbreviated instrument responses and their readable form
+_CONVERSIONS = {"mov": "moving", "rep": "repeat"}
+
+# Value mappings shared by all instances. These are plain dicts as they end
+# up in the parameter snapshots, which have to be JSON serializable.
+_TRIGGER_SOURCE_MAP = {
+    "immediate": "NONE",
+    "timer1": "TIM1",
+    "timer2": "TIM2",
+    "timer3": "TIM3",
+    "timer4": "TIM4",
+    "notify1": "NOT1",
+    "notify2": "NOT2",
+    "notify3": "NOT3",
+    "front-panel": "DISP",
+    "bus": "COMM",
+    "external": "EXT",
+}
+
+_DISPLAY_BACKLIGHT_MAP = {
+    "On 100": "ON100",
+    "On 75": "ON75",
+    "On 50": "ON50",
+    "On 25": "ON25",
+    "Off": "OFF",
+    "Blackout": "BLACkout",
+}
+
 
 def _parse_output_string(string_value: str) -> str:
     """Parses and cleans string output of the multimeter. Removes the surrounding
@@ -18,18 +55,17 @@ def _parse_output_string(string_value: str) -> str:
     Returns:
         The cleaned-up output of the multimeter.
     """
-    s = string_value.strip().lower()
-    if (s[0] == s[-1]) and s.startswith(("'", '"')):
+    s = string_value.strip()
+    if len(s) >= 2 and s[0] == s[-1] and s[0] in "'\"":
         s = s[1:-1]
-
-    conversions = {"mov": "moving", "rep": "repeat"}
-    if s in conversions.keys():
-        s = conversions[s]
-    return s
+    s = s.lower()
+    return _CONVERSIONS.get(s, s)
 
 
 def _parse_output_bool(numeric_value: Union[float, str]) -> bool:
     """Parses and converts the value to boolean type. True is 1.
+        Instrument responses are strings such as "0\n", which have to be
+        converted to a number first as bool("0") is True.
 
     Args:
         numeric_value: The numerical value to convert.
@@ -37,16 +73,60 @@ def _parse_output_bool(numeric_value: Union[float, str]) -> bool:
     Returns:
         The boolean representation of the numeric value.
     """
-    return bool(numeric_value)
+    return bool(int(float(str(numeric_value).strip())))
 
 
 class Keithley6500CommandSetError(Exception):
     pass
 
 
+class Keithley6500TriggerTimer(InstrumentChannel):
+    def __init__(self, parent: "Keithley6500", name: str, timer: int) -> None:
+        """One of the 4 trigger timers of the Keithley 6500.
+
+            The timer parameters are not read during snapshots, instead
+            Keithley6500 refreshes all timers with a single query.
+
+        Args:
+            parent: The Keithley6500 instance to which the timer is attached.
+            name: The name of the timer within QCoDeS.
+            timer: The number of the timer on the instrument, 1 to 4.
+        """
+        if timer not in range(1, 5):
+            raise ValueError(f"Trigger timer {timer} not in 1, ..., 4")
+
+        super().__init__(parent, name)
+        self.timer = timer
+
+        self.delay: Parameter = self.add_parameter(
+            "delay",
+            docstring="Set and read trigger delay for timer %i." % timer,
+            get_parser=float,
+            get_cmd="TRIG:TIM%i:DEL?" % timer,
+            set_cmd="TRIG:TIM%i:DEL {}" % timer,
+            unit="s",
+            vals=Numbers(min_value=0, max_value=999999.999),
+            snapshot_get=False,
+        )
+
+        self.source: Parameter = self.add_parameter(
+            "source",
+            docstring="Set the trigger source for timer %i." % timer,
+            get_cmd="TRIG:TIM%i:STAR:STIM?" % timer,
+            set_cmd="TRIG:TIM%i:STAR:STIM {}" % timer,
+            val_mapping=_TRIGGER_SOURCE_MAP,
+            snapshot_get=False,
+        )
+
+
 class Keithley6500(VisaInstrument):
     def __init__(
-        self, name: str, address: str, reset_device: bool = False, **kwargs: Any
+        self,
+        name: str,
+        address: str,
+        reset_device: bool = False,
+        ascii_mode: bool = False,
+        **kwargs: Any,
     ):
         """Driver for the Keithley 6500 multimeter. Based on the Keithley 2000 driver,
             commands have been adapted for the Keithley 6500. This driver does not contain
@@ -58,9 +138,13 @@ class Keithley6500(VisaInstrument):
             name: The name used internally by QCoDeS in the DataSet.
             address: The VISA device address.
             reset_device: Reset the device on startup if true.
+            ascii_mode: Transfer readings as ASCII text instead of binary
+                little-endian doubles.
             **kwargs: kwargs are forwarded to base class.
         """
         super().__init__(name, address, terminator="\n", **kwargs)
+        # Large chunks so buffer reads are not split into many VISA reads
+        self.visa_handle.chunk_size = 1024 * 1024
 
         command_set = self.ask("*LANG?")
         if command_set != "SCPI":
@@ -71,6 +155,7 @@ class Keithley6500(VisaInstrument):
             raise Keithley6500CommandSetError(error_msg)
 
         self._trigger_sent = False
+        self._ascii_mode = ascii_mode
 
         self._mode_map = {
             "ac current": "CURR:AC",
@@ -82,6 +167,11 @@ class Keithley6500(VisaInstrument):
             "temperature": "TEMP",
             "frequency": "FREQ",
         }
+        # mode-scoped commands, filled on first use by _mode_cmd
+        self._mode_cmds: dict[tuple[str, str], str] = {}
+        # recently read mode-scoped values, see set_param_cache_ttl
+        self._param_cache: dict[str, tuple[float, Any]] = {}
+        self._param_ttl = 0.5
 
         self.add_parameter(
             "mode",
@@ -151,14 +241,7 @@ class Keithley6500(VisaInstrument):
             "key lights on the device.",
             get_cmd="DISP:LIGH:STAT?",
             set_cmd="DISP:LIGH:STAT {}",
-            val_mapping={
-                "On 100": "ON100",
-                "On 75": "ON75",
-                "On 50": "ON50",
-                "On 25": "ON25",
-                "Off": "OFF",
-                "Blackout": "BLACkout",
-            },
+            val_mapping=_DISPLAY_BACKLIGHT_MAP,
         )
 
         self.add_parameter(
@@ -172,36 +255,14 @@ class Keithley6500(VisaInstrument):
             ),
         )
 
-        for trigger in range(1, 5):
-            self.add_parameter(
-                "trigger%i_delay" % trigger,
-                docstring="Set and read trigger delay for timer %i." % trigger,
-                get_parser=float,
-                get_cmd="TRIG:TIM%i:DEL?" % trigger,
-                set_cmd="TRIG:TIM%i:DEL {}" % trigger,
-                unit="s",
-                vals=Numbers(min_value=0, max_value=999999.999),
-            )
-
-            self.add_parameter(
-                "trigger%i_source" % trigger,
-                docstring="Set the trigger source for timer %i." % trigger,
-                get_cmd="TRIG:TIM%i:STAR:STIM?" % trigger,
-                set_cmd="TRIG:TIM%i:STAR:STIM {}" % trigger,
-                val_mapping={
-                    "immediate": "NONE",
-                    "timer1": "TIM1",
-                    "timer2": "TIM2",
-                    "timer3": "TIM3",
-                    "timer4": "TIM4",
-                    "notify1": "NOT1",
-                    "notify2": "NOT2",
-                    "notify3": "NOT3",
-                    "front-panel": "DISP",
-                    "bus": "COMM",
-                    "external": "EXT",
-                },
-            )
+        triggers = ChannelList(
+            self, "triggers", Keithley6500TriggerTimer, snapshotable=False
+        )
+        for timer in range(1, 5):
+            trigger = Keithley6500TriggerTimer(self, "trigger%i" % timer, timer)
+            self.add_submodule("trigger%i" % timer, trigger)
+            triggers.append(trigger)
+        self.add_submodule("triggers", triggers.to_channel_tuple())
 
         # Control interval between scans; the default value from the instrument is 0,
         # hence 0 is included in the validator's range of this parameter.
@@ -214,30 +275,111 @@ class Keithley6500(VisaInstrument):
             vals=Numbers(min_value=0, max_value=999999.999),
         )
 
+        # Reading triggers a measurement, so keep it out of snapshot updates
         self.add_parameter(
-            "amplitude", get_cmd=self._read_next_value, set_cmd=False, unit="a.u."
+            "amplitude",
+            get_cmd=self._read_next_value,
+            set_cmd=False,
+            unit="a.u.",
+            snapshot_get=False,
         )
 
+        # Only available in dc voltage mode, see snapshot_base for the
+        # snapshot exclusion
         self.add_parameter(
             "input_impedance",
             get_parser=str,
-            get_cmd=self._get_input_impedance,
-            set_cmd=self._set_input_impedance,
+            get_cmd=self._get_set_input_impedance,
+            set_cmd=self._get_set_input_impedance,
             val_mapping={
                 "10": "MOHM10",
                 "auto" : "AUTO"
-            }, 
-            snapshot_exclude=self.mode()== "dc voltage"
+            },
         )
 
         if reset_device:
             self.reset()
-        self.write("FORM:DATA ASCII")
+        else:
+            self._set_data_format()
         self.connect_message()
 
     def reset(self) -> None:
-        """Reset the device"""
+        """Reset the device. *RST also resets the data format, so it is set
+            again afterwards.
+        """
         self.write("*RST")
+        self.mode.cache.invalidate()
+        self._param_cache.clear()
+        self._set_data_format()
+
+    def _set_data_format(self) -> None:
+        """Select the transfer format of readings, see ascii_mode."""
+        if self._ascii_mode:
+            self.write("FORM:DATA ASCII")
+        else:
+            self.write("FORM:DATA REAL")
+            self.write("FORM:BORD SWAP")
+
+    def snapshot_base(
+        self,
+        update: Optional[bool] = False,
+        params_to_skip_update: Optional[Sequence[str]] = None,
+    ) -> dict[Any, Any]:
+        """Exclude input_impedance from the snapshot unless the multimeter is
+        in dc voltage mode, as the setting does not exist in other modes.
+        When updating, all trigger timers are refreshed with one query. If
+        that query fails, the timers keep their cached values.
+        """
+        if update:
+            try:
+                self._get_trigger_status()
+            except (RuntimeError, KeyError, ValueError, VisaIOError) as e:
+                log.warning(
+                    f"{self.name}: trigger status query failed ({e}), "
+                    "keeping cached trigger settings"
+                )
+        # an updating snapshot must go by the mode the instrument is in now,
+        # a plain one never queries it just to decide what to leave out
+        if update:
+            mode = self.mode.get_latest()
+        else:
+            mode = self.mode.cache.get(get_if_invalid=False)
+        self.input_impedance.snapshot_exclude = mode != "dc voltage"
+        return super().snapshot_base(
+            update=update, params_to_skip_update=params_to_skip_update
+        )
+
+    def set_param_cache_ttl(self, seconds: float) -> None:
+        """Set how long values of mode-scoped parameters (nplc, range, ...) are
+            reused before the instrument is queried again. Setting any of these
+            parameters discards all cached values.
+
+        Args:
+            seconds: Time to live of cached values, 0 disables the cache.
+        """
+        self._param_ttl = seconds
+        self._param_cache.clear()
+
+    def _get_trigger_status(self) -> None:
+        """Read delay and source of every trigger timer with one compound query
+        and store the results in the parameter caches.
+        """
+        cmd = ";:".join(
+            "TRIG:TIM%i:DEL?;:TRIG:TIM%i:STAR:STIM?" % (timer.timer, timer.timer)
+            for timer in self.triggers
+        )
+        vals = self.ask(cmd).split(";")
+        if len(vals) != 2 * len(self.triggers):
+            raise RuntimeError(f"Unexpected trigger status response: {vals}")
+        # parse everything before touching a cache, so a malformed response
+        # leaves all timers as they were
+        status = [
+            (float(delay), timer.source.inverse_val_mapping[source.strip()])
+            for timer, delay, source in zip(self.triggers, vals[::2], vals[1::2])
+        ]
+        for timer, (delay, source) in zip(self.triggers, status):
+            timer.delay.cache.set(delay)
+            timer.source.cache.set(source)
 
     def trigger(self) -> None:
         """Trigger the device"""
@@ -250,39 +392,70 @@ class Keithley6500(VisaInstrument):
         self.write("*WAI")
 
 
-    def _assert_mode(self, mode: str, msg:str=None) -> bool:
-        curr_mode = self.mode()
+    def _assert_mode(self, mode: str, msg: Optional[str] = None) -> None:
+        """Raises a ValueError if the multimeter is not in the given mode. The
+            mode is taken from the parameter cache, so no query is made unless
+            the mode is unknown.
+
+        Args:
+            mode: The required mode, e.g. "dc voltage".
+            msg: Start of the error message, the current mode is appended.
+        """
+        curr_mode = self.mode.get_latest()
         if curr_mode != mode:
-            emsg = msg + f" {curr_mode}" if msg != None else "Incorrect Mode Setting"
-            raise ValueError(emsg) 
-        
-    def _get_set_input_impedance(self, imp_mode:str = None):
-        """Get or set (if imp_mode not None) input impedance setting if instrument in dc voltage mode. """
-        self._assert_mode("dc voltage", f"No input impedance settings in current mode: ") 
-        cmd = ":VOLT:DC:INPutimpedance"
-        cmd += "?" if imp_mode == None else f" {imp_mode}"
-        
-        if imp_mode == None:
-            self.write(cmd)
-
-
-    def _get_input_impedance(self) -> str:
-        """Get input impedance setting if instrument in dc voltage mode"""
-        self._assert_mode("dc voltage", f"No input impedance settings for ")
-        cmd = ":VOLT:DC:INPutimpedance?"
-        return self.ask(cmd)
-    
-    def _set_input_impedance(self, imp_mode:str) -> None:
-        self._assert_mode("dc voltage", f"No input impedance settings for ")
-        cmd = f":VOLT:DC:INPutimpedance {imp_mode}"
-        self.write(cmd)
+            raise ValueError(f"{msg or 'Incorrect Mode Setting:'} {curr_mode}")
+
+    def _get_set_input_impedance(self, imp_mode: Optional[str] = None) -> Optional[str]:
+        """Get or set (if imp_mode not None) input impedance setting if instrument in dc voltage mode."""
+        self._assert_mode("dc voltage", "No input impedance settings for")
+        if imp_mode is None:
+            return self.ask(":VOLT:DC:INPutimpedance?")
+        self.write(f":VOLT:DC:INPutimpedance {imp_mode}")
+        return None
 
+    def read_trace(self, npts: int) -> np.ndarray:
+        """Read the first npts readings stored in the default reading buffer.
+
+        Args:
+            npts: Number of readings to return.
+
+        Returns:
+            The readings as a numpy array.
+        """
+        cmd = f"TRAC:DATA? 1,{npts},'defbuffer1',READ"
+        if self._ascii_mode:
+            return self.visa_handle.query_ascii_values(cmd, container=np.array)
+        with self._binary_mode():
+            return self.visa_handle.query_binary_values(
+                cmd, datatype="d", is_big_endian=False, container=np.array
+            )
+
+    @contextmanager
+    def _binary_mode(self) -> Iterator[None]:
+        """Disables the read termination while reading a binary block, so the
+            data is not scanned for the termination character. The block is
+            then read until the end of the message, which already includes
+            the terminator sent after it.
+        """
+        handle = self.visa_handle
+        termination = handle.read_termination
+        handle.read_termination = None
+        try:
+            yield
+        finally:
+            handle.read_termination = termination
 
     def _read_next_value(self) -> float:
-        return float(self.ask("READ?"))
+        if self._ascii_mode:
+            return float(self.ask("READ?"))
+        values = self.visa_handle.query_binary_values(
+            "READ?", datatype="d", is_big_endian=False
+        )
+        return float(values[0])
 
     def _get_mode_param(self, parameter: str, parser: Callable[[str], T]) -> T:
         """Reads the current mode of the multimeter and ask for the given parameter.
+            The mode is taken from the parameter cache and only queried if unknown.
 
         Args:
             parameter: The asked parameter after getting the current mode.
@@ -291,12 +464,20 @@ class Keithley6500(VisaInstrument):
         Returns:
             Any: the parsed ask command. The parser determines the return data-type.
         """
-        mode = _parse_output_string(self._mode_map[self.mode()])
-        cmd = f"{mode}:{parameter}?"
-        return parser(self.ask(cmd))
+        cmd = self._mode_cmd(parameter)
+        now = monotonic()
+        cached = self._param_cache.get(cmd)
+        if cached is not None and now - cached[0] < self._param_ttl:
+            return cached[1]
+
+        value = parser(self.ask(cmd + "?"))
+        if self._param_ttl > 0:
+            self._param_cache[cmd] = (now, value)
+        return value
 
     def _set_mode_param(self, parameter: str, value: Union[str, float, bool]) -> None:
         """Gets the current mode of the multimeter and sets the given parameter.
+            The mode is taken from the parameter cache and only queried if unknown.
 
         Args:
             parameter: The set parameter after getting the current mode.
@@ -305,6 +486,23 @@ class Keithley6500(VisaInstrument):
         if isinstance(value, bool):
             value = int(value)
 
-        mode = _parse_output_string(self._mode_map[self.mode()])
-        cmd = f"{mode}:{parameter} {value}"
-        self.write(cmd)
+        # settings interact (e.g. setting the range disables auto range),
+        # so drop every cached value rather than just this one
+        self._param_cache.clear()
+        self.write(f"{self._mode_cmd(parameter)} {value}")
+
+    def _mode_cmd(self, parameter: str) -> str:
+        """Builds the command for the given parameter in the current mode of the
+            multimeter. Commands are cached per mode and parameter.
+
+        Args:
+            parameter: The parameter, e.g. NPLC.
+
+        Returns:
+            The command without query mark or value, e.g. VOLT:DC:NPLC.
+        """
+        key = (self.mode.get_latest(), parameter)
+        cmd = self._mode_cmds.get(key)
+        if cmd is None:
+            cmd = self._mode_cmds[key] = f"{self._mode_map[key[0]]}:{parameter}"
+        return cmd
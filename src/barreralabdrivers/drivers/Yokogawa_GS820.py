@@ -1,17 +1,27 @@
 import logging
 
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
 from functools import partial
-from typing import Any, Literal, Optional, Union
+from math import isclose
+from time import monotonic, sleep
+from typing import Any, Literal, Optional, Sequence, Union
 
+import numpy as np
 import qcodes.validators as vals
 from qcodes.instrument import InstrumentChannel, VisaInstrument
 from qcodes.parameters import ( DelegateParameter, create_on_off_val_mapping, Parameter )
-from qcodes.validators import Bool, Enum, Ints, Numbers
+from qcodes.validators import Bool, Enum, Ints, Numbers, Validator
 
 ModeType = Literal["CURR", "VOLT"]
 
 log = logging.getLogger(__name__)
 
+# Static value mappings shared by every channel
+_ON_OFF_INT_MAPPING = create_on_off_val_mapping(on_val=1, off_val=0)
+_OFF_ON_STR_MAPPING = {"off": 0, "on": 1}
+
 
 def _float_round(val: float) -> int:
     """
@@ -30,6 +40,51 @@ class YokogawaGS200Exception(Exception):
     pass
 
 
+class _AllowedFloatSet(Validator[float]):
+    """
+    Requires one of a provided set of floats, compared within a relative
+    tolerance so that e.g. 0.2 and 200e-3 * 1.0000000001 both match.
+    """
+
+    def __init__(self, *values: float, rel_tol: float = 1e-9) -> None:
+        if not len(values) > 0:
+            raise TypeError("_AllowedFloatSet needs at least one value")
+
+        self._values = tuple(sorted(float(v) for v in values))
+        self._rel_tol = rel_tol
+        self._valid_values = self._values
+
+    def validate(self, value: float, context: str = "") -> None:
+        try:
+            value = float(value)
+        except (TypeError, ValueError) as e:
+            raise TypeError(f"{value!r} is not a number; {context}") from e
+
+        if self._match(value) is None:
+            raise ValueError(f"{value!r} is not in {self._values!r}; {context}")
+
+    def snap(self, value: float) -> float:
+        """
+        Return the allowed value that value matches, e.g. as a set_parser so
+        the exact allowed value is sent rather than a near-match.
+        """
+        allowed = self._match(float(value))
+        if allowed is None:
+            raise ValueError(f"{value!r} is not in {self._values!r}")
+        return allowed
+
+    def _match(self, value: float) -> Optional[float]:
+        # only the allowed values either side of value can be close to it
+        i = bisect_left(self._values, value)
+        for allowed in self._values[max(i - 1, 0) : i + 1]:
+            if isclose(value, allowed, rel_tol=self._rel_tol):
+                return allowed
+        return None
+
+    def __repr__(self) -> str:
+        return f"<_AllowedFloatSet: {self._values!r}>"
+
+
 
 class YokogawaGS820Channel(InstrumentChannel): 
     """
@@ -55,6 +110,20 @@ class YokogawaGS820Channel(InstrumentChannel):
         self._extra_visa_timeout = 5000
         self.channel = channel
 
+        # Level commands are sent on every set/ramp step, so build them once
+        self._lev_tmpl = {
+            mode: f"{channel}:SOUR:{mode}:LEV %.5e" for mode in ("VOLT", "CURR")
+        }
+        self._lev_query = {
+            mode: f"{channel}:SOUR:{mode}:LEV?" for mode in ("VOLT", "CURR")
+        }
+
+        # Level and range reads are answered from recent reads and writes for
+        # _read_ttl seconds. Set _cache_reads to False for live readback.
+        self._cache_reads = True
+        self._read_ttl = 0.05
+        self._read_cache: dict[str, tuple[float, float]] = {}
+
         self.vrange = self._parent.vranges[self.model]
         self.irange = self._parent.iranges[self.model]
 
@@ -63,7 +132,7 @@ class YokogawaGS820Channel(InstrumentChannel):
             label="Output State",
             get_cmd=self.state,
             set_cmd=lambda x: self.on() if x else self.off(),
-            val_mapping=create_on_off_val_mapping(on_val=1, off_val=0), 
+            val_mapping=_ON_OFF_INT_MAPPING, 
             instrument=self
         )
         """Control channel output"""
@@ -81,8 +150,13 @@ class YokogawaGS820Channel(InstrumentChannel):
         # We need to get the source_mode value here as we cannot rely on the
         # default value that may have been changed before we connect to the
         # instrument (in a previous session or via the frontpanel).
-        
-        # self.source_mode()
+        # It is read once and reused for every mode-dependent setting below.
+        mode = self.source_mode()
+
+        # near-matches are accepted but the exact range is sent, as the
+        # instrument picks the smallest range holding the value
+        vrange_vals = _AllowedFloatSet(*self.vrange)
+        irange_vals = _AllowedFloatSet(*self.irange)
 
         self.voltage_range = Parameter(
             "voltage_range",
@@ -91,8 +165,9 @@ class YokogawaGS820Channel(InstrumentChannel):
             get_cmd=partial(self._get_range, "VOLT"),
             set_cmd=partial(self._set_range, "VOLT"),
             get_parser=float,
-            vals=Enum(*self.vrange),
-            snapshot_exclude=self.source_mode() == "CURR",
+            set_parser=vrange_vals.snap,
+            vals=vrange_vals,
+            snapshot_exclude=mode == "CURR",
             instrument=self
         )
         """Parameter Voltage Range"""
@@ -103,9 +178,10 @@ class YokogawaGS820Channel(InstrumentChannel):
             unit="I",
             get_cmd=partial(self._get_range, "CURR"),
             set_cmd=partial(self._set_range, "CURR"),
-            vals=Enum(*self.irange),
+            vals=irange_vals,
             get_parser=float,
-            snapshot_exclude=self.source_mode() == "VOLT",
+            set_parser=irange_vals.snap,
+            snapshot_exclude=mode == "VOLT",
             instrument=self
         )
         """Parameter Current Range"""
@@ -120,7 +196,7 @@ class YokogawaGS820Channel(InstrumentChannel):
             set_cmd=self._set_auto_range,
             get_cmd=f"{self.channel}:SOUR:RANGE:AUTO?",
             # initial_cache_value=False,
-            val_mapping=create_on_off_val_mapping(on_val=1, off_val=0),
+            val_mapping=_ON_OFF_INT_MAPPING,
             instrument=self
         )
         """Toggle auto range mode"""
@@ -132,7 +208,7 @@ class YokogawaGS820Channel(InstrumentChannel):
             set_cmd=partial(self._get_set_output, "VOLT"),
             get_cmd=partial(self._get_set_output, "VOLT"),
             get_parser=float,
-            snapshot_exclude=self.source_mode() == "CURR",
+            snapshot_exclude=mode == "CURR",
             instrument=self
         )
         """Parameter Voltage"""
@@ -144,7 +220,7 @@ class YokogawaGS820Channel(InstrumentChannel):
             set_cmd=partial(self._get_set_output, "CURR"),
             get_cmd=partial(self._get_set_output, "CURR"),
             get_parser=float,
-            snapshot_exclude=self.source_mode() == "VOLT",
+            snapshot_exclude=mode == "VOLT",
             instrument=self
         )
         """Parameter Current"""
@@ -157,7 +233,7 @@ class YokogawaGS820Channel(InstrumentChannel):
         # We need to pass the source parameter for delegate parameters
         # (range and output_level) here according to the present
         # source_mode.
-        if self.source_mode() == "VOLT":
+        if mode == "VOLT":
             self.range.source = self.voltage_range
             self.output_level.source = self.voltage
         else:
@@ -196,10 +272,7 @@ class YokogawaGS820Channel(InstrumentChannel):
             label="Four Wire Sensing",
             get_cmd=":SENS:REM?",
             set_cmd=":SENS:REM {}",
-            val_mapping={
-                "off": 0,
-                "on": 1,
-            },
+            val_mapping=_OFF_ON_STR_MAPPING,
             instrument=self
         )
 
@@ -259,20 +332,56 @@ class YokogawaGS820Channel(InstrumentChannel):
         )
 
 
+    def drain_errors(self, batch: int = 8, max_queries: int = 16) -> list[str]:
+        """
+        Read and clear the error queue, asking for several errors per
+        compound query.
+
+        Args:
+            batch: Number of errors requested per query
+            max_queries: Number of queries after which to give up if the
+                queue never reports empty
+
+        Returns:
+            The queued error messages, oldest first
+        """
+        query = ";".join([":SYST:ERR?"] * batch)
+        errors = []
+        for _ in range(max_queries):
+            for resp in self.ask(query).split(";"):
+                resp = resp.strip()
+                if resp.startswith("0,") or "No error" in resp:
+                    return errors
+                errors.append(resp)
+        log.warning(
+            f"{self.full_name}: error queue not empty after {len(errors)} "
+            "errors, stopped reading"
+        )
+        return errors
+
     def on(self) -> None:
         """Turn output on"""
         self.write(f"{self.channel}:OUTPUT:STATE 1")
-        
+        self.output.cache.set(True)
+
     def off(self) -> None:
         """Turn output off"""
         self.write(f"{self.channel}:OUTPUT:STATE 0")
+        self.output.cache.set(False)
 
     def state(self) -> int:
-        """Check state"""
-        state = int(self.ask("OUTPUT:STATE?"))
-        return state
+        """
+        Check state. The output only changes through on() and off(), which
+        update the cache, so the instrument is only queried when the cache
+        has been invalidated.
+        """
+        if self.output.cache.valid:
+            return self.output.cache.raw_value
+        return int(self.ask(f"{self.channel}:OUTPUT:STATE?"))
 
-    def ramp_voltage(self, ramp_to: float, step: float, delay: float) -> None:
+    def ramp_voltage(
+        self, ramp_to: float, step: float, delay: float, batch_size: int = 1
+    ) -> None:
         """
         Ramp the voltage from the current level to the specified output.
 
@@ -281,11 +390,15 @@ class YokogawaGS820Channel(InstrumentChannel):
             step: The ramp steps in Volt
             delay: The time between finishing one step and
                 starting another in seconds.
+            batch_size: Number of steps sent in a single write, see
+                _ramp_source.
         """
         self._assert_mode("VOLT")
-        self._ramp_source(ramp_to, step, delay)
+        self._ramp_source(ramp_to, step, delay, batch_size)
 
-    def ramp_current(self, ramp_to: float, step: float, delay: float) -> None:
+    def ramp_current(
+        self, ramp_to: float, step: float, delay: float, batch_size: int = 1
+    ) -> None:
         """
         Ramp the current from the current level to the specified output.
 
@@ -294,29 +407,49 @@ class YokogawaGS820Channel(InstrumentChannel):
             step: The ramp steps in Ampere
             delay: The time between finishing one step and starting
                 another in seconds.
+            batch_size: Number of steps sent in a single write, see
+                _ramp_source.
         """
         self._assert_mode("CURR")
-        self._ramp_source(ramp_to, step, delay)
+        self._ramp_source(ramp_to, step, delay, batch_size)
 
-    def _ramp_source(self, ramp_to: float, step: float, delay: float) -> None:
+    def _ramp_source(
+        self, ramp_to: float, step: float, delay: float, batch_size: int = 1
+    ) -> None:
         """
-        Ramp the output from the current level to the specified output
+        Ramp the output from the current level to the specified output.
+        The ramp is computed up front and the levels are written directly,
+        without querying the range and mode for every step.
 
         Args:
             ramp_to: The ramp target in volts/amps
             step: The ramp steps in volts/ampere
             delay: The time between finishing one step and
                 starting another in seconds.
+            batch_size: Number of steps joined into a single write. Steps
+                within a write are applied back to back, so values above 1
+                trade ramp smoothness for fewer bus transactions.
         """
-        saved_step = self.output_level.step
-        saved_inter_delay = self.output_level.inter_delay
-
-        self.output_level.step = step
-        self.output_level.inter_delay = delay
-        self.output_level(ramp_to)
-
-        self.output_level.step = saved_step
-        self.output_level.inter_delay = saved_inter_delay
+        # a non-positive step would turn the ramp into a single jump
+        if not step > 0:
+            raise ValueError(f"step must be positive, got {step}")
+        self._check_output_level(ramp_to)
+        tmpl = self._lev_tmpl[self.source_mode.get_latest()]
+        current = self.output_level.get_latest()
+        # cleanup code often ramps to where the output already is
+        if np.isclose(ramp_to, current, rtol=0, atol=1e-12):
+            return
+
+        npts = int(np.ceil(abs(ramp_to - current) / step)) + 1
+        points = np.linspace(current, ramp_to, max(npts, 2))[1:]
+        cmds = [tmpl % level for level in points]
+        for i in range(0, len(cmds), batch_size):
+            if i > 0:
+                sleep(delay * batch_size)
+            self.write(";:".join(cmds[i : i + batch_size]))
+
+        self.output_level.cache.set(ramp_to)
+        self._store_read(self._lev_query[self.source_mode.get_latest()], ramp_to)
 
     def _get_set_output(
         self, mode: ModeType, output_level: Optional[float] = None
@@ -333,7 +466,7 @@ class YokogawaGS820Channel(InstrumentChannel):
         if output_level is not None:
             self._set_output(output_level)
             return None
-        return float(self.ask(f"{self.channel}:SOUR:{mode}:LEV?"))
+        return self._cached_ask(self._lev_query[mode])
 
     def _set_output(self, output_level: float) -> None:
         """
@@ -343,36 +476,7 @@ class YokogawaGS820Channel(InstrumentChannel):
             output_level: output level in Volt or Ampere, depending
                 on the current mode.
         """
-        auto_enabled = self.auto_range()
-        mode = self.source_mode.get_latest()
-        if not auto_enabled:
-            self_range = self.range()
-            if self_range is None:
-                raise RuntimeError(
-                    "Trying to set output but not in auto mode and range is unknown."
-                )
-        else:
-            if mode == "CURR":
-                self_range = max(self.vrange)
-            else:
-                self_range = max(self.vrange)
-
-        # Check we are not trying to set an out of range value
-        if self.range() is None or abs(output_level) > abs(self_range):
-            # Check that the range hasn't changed
-            if not auto_enabled:
-                self_range = self.range.get_latest()
-                if self_range is None:
-                    raise RuntimeError(
-                        "Trying to set output but not in"
-                        " auto mode and range is unknown."
-                    )
-            # If we are still out of range, raise a value error
-            if abs(output_level) > abs(self_range):
-                raise ValueError(
-                    "Desired output level not in range"
-                    f" [-{self_range:.3}, {self_range:.3}]"
-                )
+        self._check_output_level(output_level)
 
         # if auto_enabled:
         #     auto_str = ":AUTO"
@@ -380,8 +484,69 @@ class YokogawaGS820Channel(InstrumentChannel):
         #     auto_str = ""
         # cmd_str = f":SOUR:LEV{auto_str} {output_level:.5e}"
         mode = self.source_mode.get_latest()
-        cmd_str = f"{self.channel}:SOUR:{mode}:LEV {output_level:.5e}"
+        cmd_str = self._lev_tmpl[mode] % output_level
         self.write(cmd_str)
+        self._store_read(self._lev_query[mode], output_level)
+
+    def _cached_ask(self, cmd: str) -> float:
+        """
+        Query a float, reusing a value read or written within the last
+        _read_ttl seconds.
+
+        Args:
+            cmd: The query to send
+        """
+        now = monotonic()
+        cached = self._read_cache.get(cmd)
+        if (
+            self._cache_reads
+            and cached is not None
+            and now - cached[0] < self._read_ttl
+        ):
+            return cached[1]
+
+        value = float(self.ask(cmd))
+        self._store_read(cmd, value)
+        return value
+
+    def _store_read(self, cmd: str, value: float) -> None:
+        """
+        Remember the value of a query after reading or writing it.
+
+        Args:
+            cmd: The query whose answer is now known
+            value: The answer
+        """
+        if self._cache_reads:
+            self._read_cache[cmd] = (monotonic(), float(value))
+
+    def _check_output_level(self, output_level: float) -> None:
+        """
+        Check that an output level can be set in the present range.
+
+        Args:
+            output_level: output level in Volt or Ampere, depending
+                on the current mode.
+        """
+        auto_enabled = self.auto_range.cache.get(get_if_invalid=True)
+        if auto_enabled:
+            if self.source_mode.get_latest() == "CURR":
+                self_range = max(self.irange)
+            else:
+                self_range = max(self.vrange)
+        else:
+            self_range = self.range.get_latest()
+            if self_range is None:
+                raise RuntimeError(
+                    "Trying to set output but not in auto mode and range is unknown."
+                )
+
+        # Check we are not trying to set an out of range value
+        if abs(output_level) > abs(self_range):
+            raise ValueError(
+                "Desired output level not in range"
+                f" [-{self_range:.3}, {self_range:.3}]"
+            )
 
     # def _update_measurement_module(
     #     self,
@@ -422,6 +587,11 @@ class YokogawaGS820Channel(InstrumentChannel):
         #     self.measure._enabled &= not val
 
         self.write(f"{self.channel}:SOUR:RANGE:AUTO {val}")
+        self._read_cache.clear()
+        # The instrument picks its own range while auto range is on, so
+        # the cached ranges cannot be trusted once it is switched off.
+        self.voltage_range.cache.invalidate()
+        self.current_range.cache.invalidate()
 
     def _assert_mode(self, mode: ModeType) -> None:
         """
@@ -447,32 +617,43 @@ class YokogawaGS820Channel(InstrumentChannel):
             mode: "CURR" or "VOLT"
 
         """
-        if self.output() == "on":
-            raise YokogawaGS200Exception("Cannot switch mode while source is on")
+        if self.source_mode.get_latest() == mode:
+            return
 
-        if mode == "VOLT":
-            self.range.source = self.voltage_range
-            self.output_level.source = self.voltage
-            self.voltage_range.snapshot_exclude = False
-            self.voltage.snapshot_exclude = False
-            self.current_range.snapshot_exclude = True
-            self.current.snapshot_exclude = True
-        else:
-            self.range.source = self.current_range
-            self.output_level.source = self.current
-            self.voltage_range.snapshot_exclude = True
-            self.voltage.snapshot_exclude = True
-            self.current_range.snapshot_exclude = False
-            self.current.snapshot_exclude = False
+        if self.output():
+            raise YokogawaGS200Exception("Cannot switch mode while source is on")
 
-        self.write(f"{self.channel}:SOUR:FUNC {mode}")
+        self._use_mode_parameters(mode)
         # We set the cache here since `_update_measurement_module`
         # needs the current value which would otherwise only be set
         # after this method exits
         self.source_mode.cache.set(mode)
+        self.write(f"{self.channel}:SOUR:FUNC {mode}")
         # Update the measurement mode
         # self._update_measurement_module(source_mode=mode)
 
+    def _use_mode_parameters(self, mode: ModeType) -> None:
+        """
+        Point the delegate parameters at the parameters of the given mode
+        and only include those in the snapshot.
+
+        Args:
+            mode: "CURR" or "VOLT"
+        """
+        curr = mode == "CURR"
+        if curr:
+            self.range.source = self.current_range
+            self.output_level.source = self.current
+        else:
+            self.range.source = self.voltage_range
+            self.output_level.source = self.voltage
+
+        for param, exclude in zip(
+            (self.voltage, self.voltage_range, self.current, self.current_range),
+            (curr, curr, not curr, not curr),
+        ):
+            param.snapshot_exclude = exclude
+
     def _set_range(self, mode: ModeType, output_range: float) -> None:
         """
         Update range
@@ -489,6 +670,9 @@ class YokogawaGS820Channel(InstrumentChannel):
         output_range = float(output_range)
         # self._update_measurement_module(source_mode=mode, source_range=output_range)
         self.write(f"{self.channel}:SOUR:{mode}:RANGE {output_range}")
+        # changing the range can also change the output level
+        self._read_cache.clear()
+        self._store_read(f"{self.channel}:SOUR:{mode}:RANGE?", output_range)
 
     def _get_range(self, mode: ModeType) -> float:
         """
@@ -504,19 +688,32 @@ class YokogawaGS820Channel(InstrumentChannel):
                 happen if the set value is smaller than the present range.
         """
         self._assert_mode(mode)
-        return float(self.ask(f"{self.channel}:SOUR:{mode}:RANGE?"))
+        return self._cached_ask(f"{self.channel}:SOUR:{mode}:RANGE?")
 
 
 
     def reset(self) -> None:
         """
         Reset instrument to factory defaults.
-        This resets only the relevant channel.
+        This resets only the relevant channel. The output is known to be
+        off afterwards, every other setting is read again on its next get.
+        Call snapshot(update=True) for a full readback.
         """
         self.write(f"{self.channel}.reset()")
-        # remember to update all the metadata
-        log.debug(f"Reset channel {self.channel}. Updating settings...")
-        self.snapshot(update=True)
+        self._sync_after_reset()
+        log.debug(f"Reset channel {self.channel}.")
+
+    def _sync_after_reset(self) -> None:
+        """
+        Drop cached settings after the channel has been reset. The output
+        is known to be off, everything else is read again on its next get.
+        """
+        self._read_cache.clear()
+        for param in self.parameters.values():
+            param.cache.invalidate()
+        self.output.cache.set(False)
+        # the delegate parameters follow the source mode, so read it now
+        self._use_mode_parameters(self.source_mode())
 
 
 class YokogawaGS820(VisaInstrument):
@@ -530,9 +727,26 @@ class YokogawaGS820(VisaInstrument):
       terminator: read terminator for reads/writes to the instrument.
     """
 
+    vranges = {
+        "765601": (200e-3, 2e0, 7e0, 18e0),
+        "765602": (200e-3, 2e0, 7e0, 18e0),
+        "765611": (200e-3, 2e0, 20e0, 50e0),
+        "765612": (200e-3, 2e0, 20e0, 50e0),
+    }
+
+    iranges = {
+        "765601": (200e-9, 2e-6, 20e-6, 200e-6, 2e-3, 20e-3, 200e-3, 1.2e0, 3.2e0),
+        "765602": (200e-9, 2e-6, 20e-6, 200e-6, 2e-3, 20e-3, 200e-3, 1.2e0, 3.2e0),
+        "765611": (200e-9, 2e-6, 20e-6, 200e-6, 2e-3, 20e-3, 200e-3, 600e-3, 1.2e0),
+        "765612": (200e-9, 2e-6, 20e-6, 200e-6, 2e-3, 20e-3, 200e-3, 600e-3, 1.2e0),
+    }
+
     def __init__(
         self, name: str, address: str, terminator: str = "\n", **kwargs: Any
     ) -> None:
+        # Commands buffered by async_writes() or between async_begin() and
+        # async_end()
+        self._async_buf: Optional[list[str]] = None
         super().__init__(name, address, terminator=terminator, **kwargs)
 
         model = self.IDN()['model']
@@ -545,20 +759,6 @@ class YokogawaGS820(VisaInstrument):
         # Get model number from Identification String
         self.model = model
 
-        self.vranges = {
-            "765601": [200e-3, 2e0,7e0,18e0],
-            "765602" : [200e-3, 2e0,7e0,18e0],
-            "765611" : [200e-3, 2e0,20e0,50e0],
-            "765612" : [200e-3, 2e0,20e0,50e0]
-        }
-
-        self.iranges = {
-            "765601": [200e-9, 2e-6,20e-6,200e-6, 2e-3, 20e-3, 200e-3, 1.2e0, 3.2e0],
-            "765602" : [200e-9, 2e-6,20e-6,200e-6, 2e-3, 20e-3, 200e-3, 1.2e0, 3.2e0],
-            "765611" : [200e-9, 2e-6,20e-6,200e-6, 2e-3, 20e-3, 200e-3, 600e-3, 1.2e0],
-            "765612" : [200e-9, 2e-6,20e-6,200e-6, 2e-3, 20e-3, 200e-3, 600e-3, 1.2e0]
-        }
-
         self.channels: list[YokogawaGS820Channel] = []
         for ch in ['1','2']:
             ch_name = f"channel{ch}"
@@ -574,14 +774,166 @@ class YokogawaGS820(VisaInstrument):
 
         self.connect_message()
 
+    def ramp_many(
+        self,
+        targets: Sequence[tuple[YokogawaGS820Channel, float]],
+        step: float,
+        delay: float,
+    ) -> None:
+        """
+        Ramp several channels together. Every step is sent as a single write
+        setting all channels, instead of one write per channel.
+
+        Args:
+            targets: (channel, ramp target) pairs. Targets are in volts/amps
+                depending on the source mode of each channel.
+            step: The largest step any channel takes, in volts/ampere
+            delay: The time between finishing one step and
+                starting another in seconds.
+        """
+        # a non-positive step would turn the ramp into a single jump
+        if not step > 0:
+            raise ValueError(f"step must be positive, got {step}")
+        if not targets:
+            return
+
+        for channel, ramp_to in targets:
+            channel._check_output_level(ramp_to)
+        tmpls = [
+            channel._lev_tmpl[channel.source_mode.get_latest()]
+            for channel, _ in targets
+        ]
+        starts = [channel.output_level.get_latest() for channel, _ in targets]
+        ends = [ramp_to for _, ramp_to in targets]
+        if np.allclose(starts, ends, rtol=0, atol=1e-12):
+            return
+
+        # every channel takes the same number of steps, set by the longest ramp
+        npts = int(np.ceil(np.max(np.abs(np.subtract(ends, starts))) / step)) + 1
+        points = np.linspace(starts, ends, max(npts, 2))[1:]
+        for i, row in enumerate(points.tolist()):
+            if i > 0:
+                sleep(delay)
+            self.write(";:".join(tmpl % level for tmpl, level in zip(tmpls, row)))
+
+        for channel, ramp_to in targets:
+            channel.output_level.cache.set(ramp_to)
+            channel._store_read(
+                channel._lev_query[channel.source_mode.get_latest()], ramp_to
+            )
+
+    @contextmanager
+    def async_writes(self) -> Iterator[None]:
+        """
+        Buffer writes within the context and send them as one compound
+        command on exit, e.g.
+
+            with yoko.async_writes():
+                yoko.ch1.output_level(0.1)
+                yoko.ch2.output_level(0.2)
+
+        The buffer is flushed and closed even if the block raises, as the
+        parameter caches already hold the buffered values. Nested blocks
+        leave the sending to the outermost one.
+        """
+        if self._async_buf is not None:
+            yield
+            return
+        self.async_begin()
+        try:
+            yield
+        finally:
+            self._close_async_buf()
+        self.ask("*OPC?")
+
+    def async_begin(self) -> None:
+        """
+        Start buffering writes. Commands written by the instrument or its
+        channels are held back until async_end() and then sent as a
+        single compound command. Queries flush the buffer first, so
+        reads still see every preceding write. Prefer async_writes(),
+        which also ends buffering if an error occurs.
+        """
+        if self._async_buf is None:
+            self._async_buf = []
+
+    def async_end(self) -> None:
+        """
+        Send all buffered commands in one write and wait for the
+        instrument to finish processing them.
+        """
+        self._close_async_buf()
+        self.ask("*OPC?")
+
+    def write_raw(self, cmd: str) -> None:
+        if self._async_buf is not None:
+            self._async_buf.append(cmd)
+            return
+        super().write_raw(cmd)
+
+    def ask_raw(self, cmd: str) -> str:
+        self._flush_async_buf()
+        return super().ask_raw(cmd)
+
+    def _close_async_buf(self) -> None:
+        """
+        Send the buffered commands and stop buffering, even if sending fails.
+        """
+        try:
+            self._flush_async_buf()
+        finally:
+            self._async_buf = None
+
+    def _flush_async_buf(self) -> None:
+        """
+        Send the buffered commands, if any, as one compound command.
+        """
+        if not self._async_buf:
+            return
+        cmd = self._compound(self._async_buf)
+        self._async_buf.clear()
+        super().write_raw(cmd)
+
+    def query_many(self, queries: Sequence[str]) -> list[str]:
+        """
+        Send several queries as one compound query, e.g. to read a setting
+        of both channels in a single round-trip.
+
+        Args:
+            queries: The queries to send
+
+        Returns:
+            The responses, in the order of the queries
+        """
+        if not queries:
+            return []
+        resps = self.ask(self._compound(queries)).split(";")
+        if len(resps) != len(queries):
+            raise RuntimeError(f"Unexpected response to {queries}: {resps}")
+        return [resp.strip() for resp in resps]
+
+    @staticmethod
+    def _compound(cmds: Sequence[str]) -> str:
+        """
+        Join commands into one compound command. Relative headers are
+        rooted so every command in the chain is parsed from the top of
+        the command tree.
+        """
+        return ";".join(
+            cmd if cmd.startswith((":", "*")) else f":{cmd}" for cmd in cmds
+        )
+
     def _display_settext(self, text: str) -> None:
-        self.visa_handle.write(f"SYST:DISP:TEXT \"{text}\"")
+        # through write() so it keeps its place among buffered writes
+        self.write(f"SYST:DISP:TEXT \"{text}\"")
 
     def reset(self) -> None:
         """
         Returns instrument to default settings, cancels all pending commands.
         """
         self.write("*RST")
+        for channel in self.channels:
+            channel._sync_after_reset()
 
     
 
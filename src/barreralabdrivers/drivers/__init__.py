@@ -1,6 +1,6 @@
 from .ACDAC_9106 import ( ACDAC9106, ACDAC9106Channel)
 from .DCDAC_5764 import ( DCDAC5764, DCDAC5764Channel )
-from .Keithley_6500 import ( Keithley6500, Keithley6500CommandSetError )
+from .Keithley_6500 import ( Keithley6500, Keithley6500CommandSetError, Keithley6500TriggerTimer )
 from .Yokogawa_GS820 import ( YokogawaGS820, YokogawaGS820Channel, YokogawaGS200Exception )
 
 __all__ = [
@@ -10,6 +10,7 @@ __all__ = [
     "DCDAC5764Channel",
     "Keithley6500",
     "Keithley6500CommandSetError",
+    "Keithley6500TriggerTimer",
     "YokogawaGS820",
     "YokogawaGS820Channel",
     "YokogawaGS200Exception",
@@ -0,0 +1,112 @@
+import logging
+
+from time import monotonic, sleep
+from collections.abc import Sequence
+from typing import Any, Optional
+from qcodes.instrument import VisaInstrument
+from pyvisa.errors import VisaIOError
+
+log = logging.getLogger(__name__)
+
+
+class ArduinoDACBase(VisaInstrument):
+    """
+    Behaviour shared by the Arduino based DACs: waiting for the board to
+    boot, caching its identity and refreshing snapshots with one compound
+    status query. Subclasses implement _get_status.
+    """
+
+    def __init__(
+        self, name: str, address: str, terminator: str = "\n", **kwargs: Any
+    ) -> None:
+        # identity of the DAC, read once by get_idn
+        self._idn: Optional[dict[str, Optional[str]]] = None
+        super().__init__(name, address, terminator=terminator, **kwargs)
+
+    def _wait_ready(self, timeout: float = 3.5) -> None:
+        """
+        Poll *IDN? with exponential backoff until the Arduino answers.
+
+        Args:
+            timeout: Maximum time to wait for the instrument in seconds
+        """
+        deadline = monotonic() + timeout
+        delay = 0.05
+        visa_timeout = self.visa_handle.timeout
+        self.visa_handle.timeout = 200
+        try:
+            while True:
+                try:
+                    self.visa_handle.query("*IDN?")
+                    return
+                except VisaIOError:
+                    if monotonic() >= deadline:
+                        raise TimeoutError(
+                            f"{self.name} did not respond within {timeout} s"
+                        )
+                    # drop any partial response before trying again
+                    self.visa_handle.clear()
+                    sleep(delay)
+                    delay = min(delay * 2, 0.4)
+        finally:
+            self.visa_handle.timeout = visa_timeout
+
+    def get_idn(self) -> dict[str, Optional[str]]:
+        """
+        The identity of the DAC cannot change during a session, so *IDN? is
+        only queried the first time and later calls return a copy.
+        """
+        if self._idn is None:
+            self._idn = super().get_idn()
+        return dict(self._idn)
+
+    def snapshot_base(
+        self,
+        update: Optional[bool] = False,
+        params_to_skip_update: Optional[Sequence[str]] = None,
+    ) -> dict[Any, Any]:
+        """
+        Refresh the parameters read by _get_status with a single query before
+        building the snapshot, so that an updating snapshot costs one
+        round-trip instead of one per parameter. If the bulk query fails, the
+        parameters are read one by one instead.
+        """
+        if update:
+            try:
+                self._get_status()
+            except (RuntimeError, ValueError, VisaIOError) as e:
+                # let every parameter be read on its own, as a plain
+                # snapshot would
+                log.warning(
+                    f"{self.name}: bulk status query failed ({e}), "
+                    "updating parameters one by one"
+                )
+            else:
+                # caches are now fresh, only fetch what is still invalid
+                update = None
+        return super().snapshot_base(
+            update=update, params_to_skip_update=params_to_skip_update
+        )
+
+    def _get_status(self) -> Any:
+        """
+        Read the instrument state with one compound query and store it in
+        the parameter caches.
+        """
+        raise NotImplementedError
+
+    def _ask_many(self, queries: Sequence[str]) -> list[str]:
+        """
+        Send several queries as one compound query.
+
+        Args:
+            queries: The queries to send
+
+        Returns:
+            The responses, in the order of the queries
+        """
+        cmd = ";".join(queries)
+        resps = self.ask(cmd).split(";")
+        if len(resps) != len(queries):
+            raise RuntimeError(f"Unexpected status response for {cmd}: {resps}")
+        return resps
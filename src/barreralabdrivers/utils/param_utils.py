@@ -1,10 +1,20 @@
-from time import sleep
+from time import monotonic, sleep
 import numpy as np
 
 
+def _sleep_until(deadline: float):
+    """
+    Sleep until the monotonic clock reaches deadline, or return at once if
+    it already has.
+    """
+    slack = deadline - monotonic()
+    if slack > 0:
+        sleep(slack)
+
+
 def paramp(
     params: tuple,
-    final: tuple = (0),
+    final=None,
     steps: int = 40,
     sleep_time: float = 0.05,
     track=True,
@@ -14,49 +24,53 @@ def paramp(
 
     Args:
         param (tuple of callables): A callable that gets and sets the parameter value.
-        final (tuple of floats): The target value to transition to.
+        final (tuple of floats): The target value to transition to. A single
+            float applies to every parameter, None ramps all of them to zero.
         steps (int): the number of steps which the paramp will take
         sleep_time (float): time per step (s)
         track (bool): Choose whether the paramaters ramp at the same time or sequentially
 
     """
 
-    # this is a legacy function which ensures that passing a single callable as params will work
-    if type(params) != tuple:
-        points = np.linspace(params(), final, steps)
-        for point in points:
-            params(point)
-            sleep(sleep_time)
-
-    # this section will handle tuples of params and final
-    if type(params) == tuple:
-        points = {}
-        # this loop defines the points for user defined endpoint
-        if final != (0):
-            if len(final) != len(params):
-                raise ValueError("final and param must be the same length")
-            for i in range(len(params)):
-                par = params[i]
-                points[i] = np.linspace(par(), final[i], steps)
-
-        # this loop defines points for ramping to zero
-        elif final == (0):
-            for i in range(len(params)):
-                par = params[i]
-                points[i] = np.linspace(par(), 0, steps)
-
-        # This ramps the parameters together
-        if track == True:
-            for step in range(steps):
-                for i in range(len(params)):
-                    par = params[i]
-                    par(points[i][step])
-                sleep(sleep_time)
-
-        # This ramps the parameters sequentially
-        elif track == False:
-            for i in range(len(params)):
-                for point in points[i]:
-                    par = params[i]
-                    par(point)
-                    sleep(sleep_time)
+    # a single callable is treated as a group of one, and a single final
+    # value applies to every parameter in the group
+    params = tuple(params) if isinstance(params, (list, tuple)) else (params,)
+    if final is None:
+        finals = (0.0,) * len(params)
+    elif isinstance(final, (list, tuple)):
+        finals = tuple(final)
+    else:
+        finals = (float(final),) * len(params)
+    if len(finals) != len(params):
+        raise ValueError("final and param must be the same length")
+
+    starts = np.array([par() for par in params], dtype=float)
+    ends = np.asarray(finals, dtype=float)
+    # nothing to do, so skip the steps * sleep_time of pacing
+    if np.allclose(starts, ends, rtol=0, atol=1e-12):
+        return
+
+    # one row per step, one column per parameter; rows and columns are
+    # converted to lists of floats once so the loops below do not unbox
+    # numpy scalars on every set
+    points = np.linspace(starts, ends, steps)
+
+    # steps are paced against fixed deadlines so that slow sets and sleep
+    # overshoot do not accumulate over the ramp
+    start = monotonic()
+
+    # This ramps the parameters together
+    if track:
+        for step, row in enumerate(points.tolist(), 1):
+            for par, point in zip(params, row):
+                par(point)
+            _sleep_until(start + step * sleep_time)
+
+    # This ramps the parameters sequentially
+    else:
+        step = 0
+        for par, column in zip(params, points.T.tolist()):
+            for point in column:
+                par(point)
+                step += 1
+                _sleep_until(start + step * sleep_time)
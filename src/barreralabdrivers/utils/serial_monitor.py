@@ -1,6 +1,5 @@
 import serial
-import argparse
-import threading
+import sys
 from time import sleep
 
 """Serial monitor utility to emulate an Arduino serial monitor.
@@ -13,47 +12,74 @@ Courtesy of ChatGPT
 """
 
 
-# Function to read from the serial device
-def read_from_serial(ser):
+# Function to read from the serial device, setting rx (if given) whenever
+# a line arrives
+def read_from_serial(ser, rx=None):
     while True:
-        if ser.in_waiting:
+        # readline blocks (without holding the GIL) until a line arrives or
+        # the port timeout expires, so this does not spin while idle
+        line = ser.readline()
+        if line:
             # Print incoming data from the serial device
-            print(ser.readline().decode("utf-8").strip())
+            sys.stdout.write(line.decode("utf-8", "replace"))
+            sys.stdout.flush()
+            if rx is not None:
+                rx.set()
+
+
+# Line endings appended to every line sent to the serial device
+LINE_ENDINGS = {"none": b"", "LF": b"\n", "CR": b"\r", "CRLF": b"\r\n"}
 
 
 # Function to send user input to the serial device
-def write_to_serial(ser, line_ending):
+def write_to_serial(ser, line_ending, rx=None, idle_timeout=2.0):
+    term = LINE_ENDINGS[line_ending]
+    # Piped input is sent in a single write, then responses are printed
+    # until the device has been silent for idle_timeout seconds
+    if not sys.stdin.isatty():
+        lines = (line.rstrip("\r\n").encode("utf-8") + term for line in sys.stdin)
+        ser.write(b"".join(lines))
+        if rx is None:
+            sleep(idle_timeout)
+            return
+        while rx.wait(idle_timeout):
+            rx.clear()
+        return
     while True:
         # Get user input
         user_input = input("> ")
-        # Append line ending based on user choice
-        if line_ending == "LF":
-            user_input += "\n"
-        elif line_ending == "CR":
-            user_input += "\r"
-        elif line_ending == "CRLF":
-            user_input += "\r\n"
-        # Send to serial device
-        ser.write(user_input.encode("utf-8"))
+        # Send to serial device with the chosen line ending
+        ser.write(user_input.encode("utf-8") + term)
         # Sleep to allow time for response
         sleep(0.1)
 
 
-def start_serial_monitor(port, baudrate, line_ending, timeout):
+def start_serial_monitor(port, baudrate, line_ending, timeout, idle_timeout=2.0):
+    # Without a timeout readline would hold back partial lines indefinitely
+    if timeout is None:
+        timeout = 0.1
+    import threading
+
     try:
         with serial.Serial(port, baudrate, timeout=timeout) as ser:
             print(f"Connected to {port} at {baudrate} baud.")
             # Allow serial device to initialize (Arduino takes time to boot)
             sleep(3)
             # Start a thread to handle reading from the serial device
-            threading.Thread(target=read_from_serial, args=(ser,), daemon=True).start()
+            rx = threading.Event()
+            threading.Thread(
+                target=read_from_serial, args=(ser, rx), daemon=True
+            ).start()
             # Main thread handles user input and writing to serial
-            write_to_serial(ser, line_ending)
+            write_to_serial(ser, line_ending, rx, idle_timeout)
     except serial.SerialException as e:
         print(f"Error: {e}")
 
 
 def start_serial_monitor_cli():
+    # only the command line entry point needs argparse
+    import argparse
+
     parser = argparse.ArgumentParser(description="Arduino Serial Monitor Utility")
     parser.add_argument(
         "--port", type=str, required=True, help="COM port (e.g., COM3 or /dev/ttyUSB0)"
@@ -70,6 +96,13 @@ def start_serial_monitor_cli():
     parser.add_argument(
         "--timeout", type=float, default=None, help="Read timeout in seconds"
     )
+    parser.add_argument(
+        "--idle",
+        type=float,
+        default=2.0,
+        help="With piped input, exit after this many seconds without incoming "
+        "data (default: 2)",
+    )
 
     args = parser.parse_args()
-    start_serial_monitor(args.port, args.baudrate, args.eol, args.timeout)
+    start_serial_monitor(args.port, args.baudrate, args.eol, args.timeout, args.idle)
@@ -1,4 +1,5 @@
 import unittest
+import pytest
 
 # import qcodes as qc
 # from qcodes.extensions import DriverTestCase
@@ -6,9 +7,15 @@ import time
 from barreralabdrivers.drivers import ACDAC9106
 
 
+# tests sharing an instrument must run in the same worker under pytest -n
+@pytest.mark.xdist_group("asrl6")
 class TestDCDAC(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # one session for the whole class, opening the port is slow
+        cls.acdac = ACDAC9106("dcdac", "ASRL6::INSTR")
+
     def setUp(self):
-        self.acdac = ACDAC9106("dcdac", "ASRL6::INSTR")
         self.acdac.reset()
 
     def test_bad_values(self):
@@ -51,8 +58,9 @@ class TestDCDAC(unittest.TestCase):
     def _get_data(self, chan: int):
         return self.acdac.channels[chan].voltage()
 
-    def tearDown(self) -> None:
-        self.acdac.close()
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.acdac.close()
 
 
 if __name__ == "__main__":
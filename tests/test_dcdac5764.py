@@ -1,18 +1,25 @@
 import unittest
+import pytest
 
 # import qcodes as qc
 # from qcodes.extensions import DriverTestCase
 import time
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from barreralabdrivers.drivers import DCDAC5764
-import random
 
 address = "ASRL4::INSTR"
 
 
+# tests sharing an instrument must run in the same worker under pytest -n
+@pytest.mark.xdist_group("asrl4")
 class TestDCDAC(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # one session for the whole class, opening the port is slow
+        cls.dcdac = DCDAC5764("dcdac", address)
+
     def setUp(self):
-        self.dcdac = DCDAC5764("dcdac", address)
         self.dcdac.reset()
 
     # def test_add_station(self):
@@ -27,9 +34,8 @@ class TestDCDAC(unittest.TestCase):
             self.assertRaises(ValueError, self._send_data, chan_num, 10.1)
 
     def test_reset(self):
-        self.dcdac.reset()
-        for chan in self.dcdac.channels:
-            self.assertAlmostEqual(chan.voltage(), 0, 3)
+        self.dcdac.reset(force=True)
+        np.testing.assert_allclose(self.dcdac.get_voltages(), np.zeros(8), atol=5e-4)
 
     @unittest.skip("demonstrating skipping")
     def test_longevity(self):
@@ -37,15 +43,19 @@ class TestDCDAC(unittest.TestCase):
         start = time.time()
         for offset in range(0, 2):
             for step in range(0, 2):
+                for chan in self.dcdac.channels:
+                    chan.offset(offset)
+                    chan.step(step)
                 for volt in range(-10, 11):
+                    # one write sets all 8 channels
+                    self.dcdac.set_voltages([volt] * 8)
+                    # read back every channel with a single query
+                    self.dcdac.refresh()
                     for chan in self.dcdac.channels:
-                        chan.offset(offset)
-                        chan.step(step)
-                        chan.voltage(volt)
-                        meas = chan.voltage()
+                        meas = chan.voltage.get_latest()
                         if abs(meas - volt) > 0.0005:
                             print(f"Bad at {chan} with {volt}")
-                        volts.append(chan.voltage())
+                        volts.append(meas)
         end = time.time()
 
         time_per_op = (end - start) / (4 * 21 * 8)
@@ -56,16 +66,37 @@ class TestDCDAC(unittest.TestCase):
     # @unittest.skip("demonstrating skipping")
     def test_paramp_single_chan(self):
         start = 10
-        chan = self.dcdac.channels[random.randint(0, 7)]
-        points = [(random.random() * 20 - 10) for _ in range(100)]
+        rng = np.random.default_rng(0)
+        chan = self.dcdac.channels[rng.integers(8)]
+        points = rng.uniform(-10.0, 10.0, 100).tolist()
         for point in points:
             chan.voltage(point)
-            believed = chan.voltage()
+            # a plain get would be answered from the cache, ask the DAC
+            self.dcdac.refresh()
+            believed = chan.voltage.get_latest()
             self.assertAlmostEqual(point, believed, 3)
 
+    def test_sweep(self):
+        rng = np.random.default_rng(1)
+        chan = self.dcdac.channels[rng.integers(8)]
+        points = rng.uniform(-10.0, 10.0, 100)
+        chan.sweep(points)
+        self.dcdac.refresh()
+        self.assertAlmostEqual(chan.voltage.get_latest(), points[-1], 3)
+        self.assertRaises(ValueError, chan.sweep, [0, 10.1])
+
     def test_getting(self):
+        # reset() fills the voltage caches, make every get ask the DAC
         for chan in self.dcdac.channels:
-            self.assertAlmostEqual(chan.voltage(), 0, 3)
+            chan._voltage_ttl = 0
+        try:
+            with ThreadPoolExecutor(max_workers=8) as ex:
+                futures = [ex.submit(chan.voltage) for chan in self.dcdac.channels]
+                for future in as_completed(futures):
+                    self.assertAlmostEqual(future.result(), 0, 3)
+        finally:
+            for chan in self.dcdac.channels:
+                chan._voltage_ttl = 0.5
 
     def _send_data(self, chan: int, val: float):
         self.dcdac.channels[chan].voltage(val)
@@ -73,8 +104,9 @@ class TestDCDAC(unittest.TestCase):
     def _get_data(self, chan: int):
         return self.dcdac.channels[chan].voltage()
 
-    def tearDown(self) -> None:
-        self.dcdac.close()
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.dcdac.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,102 @@
+"""
+Testing paramp with plain callables standing in for parameters
+Run by navigating to tests folder and executing
+pytest test_param_utils.py
+"""
+
+import pytest
+
+from barreralabdrivers.utils.param_utils import paramp
+
+
+class FakeParam:
+    """Gettable and settable callable that logs every set into a shared list"""
+
+    def __init__(self, name, value, log):
+        self.name = name
+        self.value = value
+        self.log = log
+
+    def __call__(self, *args):
+        if not args:
+            return self.value
+        self.value = args[0]
+        self.log.append((self.name, args[0]))
+
+
+def _params(*values):
+    log = []
+    return [FakeParam(f"p{i}", v, log) for i, v in enumerate(values)], log
+
+
+def test_tracked_order():
+    """
+    Test that tracked ramps step all parameters together
+    """
+    (a, b), log = _params(0.0, 10.0)
+
+    paramp((a, b), final=(2.0, 12.0), steps=3, sleep_time=0)
+
+    assert log == [
+        ("p0", 0.0), ("p1", 10.0),
+        ("p0", 1.0), ("p1", 11.0),
+        ("p0", 2.0), ("p1", 12.0),
+    ]
+
+
+def test_sequential_order():
+    """
+    Test that untracked ramps finish one parameter before the next
+    """
+    (a, b), log = _params(0.0, 10.0)
+
+    paramp([a, b], final=[2.0, 12.0], steps=3, sleep_time=0, track=False)
+
+    assert log == [
+        ("p0", 0.0), ("p0", 1.0), ("p0", 2.0),
+        ("p1", 10.0), ("p1", 11.0), ("p1", 12.0),
+    ]
+
+
+def test_final_none_ramps_to_zero():
+    (a, b), _ = _params(4.0, -4.0)
+
+    paramp((a, b), steps=5, sleep_time=0)
+
+    assert (a(), b()) == (0.0, 0.0)
+
+
+def test_final_scalar_applies_to_all():
+    (a, b), _ = _params(0.0, 1.0)
+
+    paramp((a, b), final=3, steps=5, sleep_time=0)
+
+    assert (a(), b()) == (3.0, 3.0)
+
+
+def test_single_callable():
+    (a,), log = _params(1.0)
+
+    paramp(a, final=(2.0,), steps=2, sleep_time=0)
+
+    assert log == [("p0", 1.0), ("p0", 2.0)]
+
+
+def test_length_mismatch():
+    (a, b), log = _params(0.0, 0.0)
+
+    with pytest.raises(ValueError):
+        paramp((a, b), final=(1.0,), sleep_time=0)
+    assert log == []
+
+
+def test_already_at_final():
+    """
+    Test that nothing is set (or slept) when all parameters are already at
+    their final values
+    """
+    (a, b), log = _params(1.0, 2.0)
+
+    paramp((a, b), final=(1.0, 2.0), steps=1000, sleep_time=10)
+
+    assert log == []
@@ -1,10 +1,13 @@
 import unittest
+import pytest
 from qcodes.extensions import DriverTestCase
 
 from barreralabdrivers.drivers import YokogawaGS820
 
 address = "TCPIP0::169.254.169.1::inst0::INSTR"
 
+# tests sharing an instrument must run in the same worker under pytest -n
+@pytest.mark.xdist_group("yokogawa")
 class TestYoko(unittest.TestCase):
     def setUp(self):
         self.yoko = YokogawaGS820("yoko820", address)
@@ -15,8 +18,11 @@ class TestYoko(unittest.TestCase):
     def test_set_modes_dual(self):
         self.yoko1.source_mode("CURR")
         self.yoko2.source_mode("VOLT")
-        self.assertEqual(self.yoko1.source_mode(), "CURR")
-        self.assertEqual(self.yoko2.source_mode(), "VOLT")
+        # read both channels in one round-trip
+        modes = self.yoko.query_many(
+            [f"{ch.channel}:SOUR:FUNC?" for ch in (self.yoko1, self.yoko2)]
+        )
+        self.assertEqual(modes, ["CURR", "VOLT"])
 
     def test_ramp_channel1(self):
         self.yoko1.source_mode("VOLT")
@@ -11,7 +11,7 @@ from barreralabdrivers.drivers import ACDAC9106
 
 # The following decorator makes the driver
 # available to all the functions in this module
-@pytest.fixture(scope="function", name="acdac_driver")
+@pytest.fixture(scope="module", name="acdac_driver")
 def _acdac_driver():
     acdac_sim = ACDAC9106(
         "acdac_sim",
@@ -23,6 +23,13 @@ def _acdac_driver():
     acdac_sim.close()
 
 
+# The simulator is loaded once per module, so put the
+# instrument back into its default state before every test
+@pytest.fixture(autouse=True)
+def _reset(acdac_driver):
+    acdac_driver.reset()
+
+
 def test_init_v1(acdac_driver):
     """
     Test that simple initialisation works
@@ -35,3 +42,65 @@ def test_init_v1(acdac_driver):
     print(idn_dict)
     assert idn_dict["vendor"] == "BARRERA"
     assert idn_dict["model"] == "ACDAC (Simulated)"
+
+
+def test_refresh(acdac_driver):
+    """
+    Test that voltages, phases and frequency are read with one compound
+    query and stored in the parameter caches
+    """
+    acdac_driver.refresh()
+
+    for i, chan in enumerate(acdac_driver.channels, 1):
+        assert chan.voltage.cache.get(get_if_invalid=False) == 100.0 * i
+        assert chan.phase.cache.get(get_if_invalid=False) == 45.0 * (i - 1)
+    assert acdac_driver.frequency.cache.get(get_if_invalid=False) == 1000.0
+
+
+def test_snapshot_update_fallback(acdac_driver, monkeypatch):
+    """
+    Test that a failing bulk query still produces an updated snapshot by
+    reading the parameters one by one
+    """
+
+    def _fail():
+        raise RuntimeError("simulated bulk query failure")
+
+    monkeypatch.setattr(acdac_driver, "_get_status", _fail)
+    snapshot = acdac_driver.snapshot(update=True)
+
+    assert snapshot["parameters"]["frequency"]["value"] == 1000.0
+    for i in range(1, 5):
+        channel = snapshot["submodules"][f"ch{i}"]
+        assert channel["parameters"]["voltage"]["value"] == 100.0 * i
+
+
+def test_set_channels_empty_no_io(acdac_driver, monkeypatch):
+    """
+    Test that setting no channels writes nothing, not even a pattern update
+    """
+    writes = []
+    monkeypatch.setattr(acdac_driver, "write_raw", writes.append)
+
+    acdac_driver.set_voltages({})
+    acdac_driver.set_phases({})
+
+    assert writes == []
+
+
+def test_single_and_bulk_set_commands(acdac_driver, monkeypatch):
+    """
+    Test that single and bulk sets send the same channel commands
+    """
+    writes = []
+    monkeypatch.setattr(acdac_driver, "write_raw", writes.append)
+
+    acdac_driver.ch2.voltage(12.5)
+    acdac_driver.ch2.phase(-45)
+    acdac_driver.set_voltages({2: 12.5})
+    acdac_driver.set_phases({2: -45})
+
+    assert writes == [
+        "CHAN2:VOLTAGE 12.5;PAT:UPDATE",
+        "CHAN2:PHASE -45;PAT:UPDATE",
+    ] * 2
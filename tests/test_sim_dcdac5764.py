@@ -4,6 +4,7 @@ Run by navigating to tests folder and executing
 pytest sim_test.py
 """
 
+import numpy as np
 import pytest
 
 from barreralabdrivers.drivers import DCDAC5764
@@ -11,7 +12,7 @@ from barreralabdrivers.drivers import DCDAC5764
 
 # The following decorator makes the driver
 # available to all the functions in this module
-@pytest.fixture(scope="function", name="dcdac_driver")
+@pytest.fixture(scope="module", name="dcdac_driver")
 def _dcdac_driver():
     dcdac_sim = DCDAC5764(
         "dcdac_sim",
@@ -23,6 +24,13 @@ def _dcdac_driver():
     dcdac_sim.close()
 
 
+# The simulator is loaded once per module, so put the
+# instrument back into its default state before every test
+@pytest.fixture(autouse=True)
+def _reset(dcdac_driver):
+    dcdac_driver.reset()
+
+
 def test_init_v1(dcdac_driver):
     """
     Test that simple initialisation works
@@ -35,3 +43,92 @@ def test_init_v1(dcdac_driver):
 
     assert idn_dict["vendor"] == "BARRERA"
     assert idn_dict["model"] == "DCDAC (Simulated)"
+
+
+def test_bad_voltage_no_io(dcdac_driver, monkeypatch):
+    """
+    Test that out of range voltages are rejected before anything is
+    written to the instrument
+    """
+    writes = []
+    monkeypatch.setattr(dcdac_driver, "write_raw", writes.append)
+
+    for chan in dcdac_driver.channels:
+        with pytest.raises(ValueError):
+            chan.voltage(-10.1)
+        with pytest.raises(ValueError):
+            chan.voltage(10.1)
+    with pytest.raises(ValueError):
+        dcdac_driver.set_voltages([0, 0, 10.1])
+
+    assert writes == []
+
+
+# voltages answered by the simulator, see DCDAC5764.yaml
+SIM_VOLTAGES = [0.0, 1.25, -2.5, 3.75, -5.0, 6.25, -7.5, 10.0]
+
+
+def test_get_voltages(dcdac_driver):
+    """
+    Test that all channels are read with one compound query and that the
+    channel caches are refreshed
+    """
+    np.testing.assert_array_equal(dcdac_driver.get_voltages(), SIM_VOLTAGES)
+
+    dcdac_driver.refresh()
+    for chan, voltage in zip(dcdac_driver.channels, SIM_VOLTAGES):
+        assert chan.voltage.cache.get(get_if_invalid=False) == voltage
+
+
+def test_snapshot_update_fallback(dcdac_driver, monkeypatch):
+    """
+    Test that a failing bulk query still produces an updated snapshot by
+    reading the channels one by one
+    """
+
+    def _fail():
+        raise RuntimeError("simulated bulk query failure")
+
+    monkeypatch.setattr(dcdac_driver, "_get_status", _fail)
+    for chan in dcdac_driver.channels:
+        # read the DAC rather than a voltage set by the reset
+        monkeypatch.setattr(chan, "_voltage_ttl", 0)
+
+    snapshot = dcdac_driver.snapshot(update=True)
+
+    for i, voltage in enumerate(SIM_VOLTAGES, 1):
+        channel = snapshot["submodules"][f"channel{i}"]
+        assert channel["parameters"]["voltage"]["value"] == voltage
+
+
+def test_set_voltage_cache(dcdac_driver, monkeypatch):
+    """
+    Test that a level is only served from cache once the cache holds it,
+    and never while its write is in flight
+    """
+    chan = dcdac_driver.channels[0]
+    seen = []
+
+    def write_raw(cmd):
+        seen.append((cmd, chan._set_time))
+
+    monkeypatch.setattr(dcdac_driver, "write_raw", write_raw)
+    monkeypatch.setattr(dcdac_driver, "ask_raw", pytest.fail)
+
+    chan.voltage(1.234567)
+
+    assert seen == [("channel1:VOLTAGE 1.234567", None)]
+    assert chan.voltage() == 1.234567
+
+
+@pytest.mark.parametrize("voltages", [{}, [], np.array([])])
+def test_set_voltages_empty_no_io(dcdac_driver, monkeypatch, voltages):
+    """
+    Test that setting no voltages writes nothing to the instrument
+    """
+    writes = []
+    monkeypatch.setattr(dcdac_driver, "write_raw", writes.append)
+
+    dcdac_driver.set_voltages(voltages)
+
+    assert writes == []
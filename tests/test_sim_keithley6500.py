@@ -0,0 +1,114 @@
+"""
+Testing Keithley6500 driver with simulated instrument
+Run by navigating to tests folder and executing
+pytest test_sim_keithley6500.py
+"""
+
+import numpy as np
+import pytest
+
+from barreralabdrivers.drivers import Keithley6500
+
+
+# The following decorator makes the driver
+# available to all the functions in this module
+@pytest.fixture(scope="module", name="dmm_driver")
+def _dmm_driver():
+    dmm_sim = Keithley6500(
+        "dmm_sim",
+        address="GPIB::1::INSTR",
+        pyvisa_sim_file="barreralabdrivers.sims:Keithley6500.yaml",
+    )
+    # fail fast instead of waiting for the default timeout
+    dmm_sim.visa_handle.timeout = 2000
+    yield dmm_sim
+
+    dmm_sim.close()
+
+
+def test_read_trace(dmm_driver):
+    """
+    Test that a binary buffer read returns the block and leaves the
+    terminator consumed, so the next query reads its own response
+    """
+    trace = dmm_driver.read_trace(1)
+
+    np.testing.assert_array_equal(trace, np.frombuffer(b"ABCDEFGH", "<f8"))
+    assert dmm_driver.ask("*LANG?") == "SCPI"
+    assert dmm_driver.visa_handle.read_termination == "\n"
+
+
+def test_snapshot_trigger_status_fallback(dmm_driver, monkeypatch):
+    """
+    Test that a malformed trigger status response does not abort an
+    updating snapshot and leaves the timer caches untouched
+    """
+    timer = dmm_driver.triggers[0]
+    timer.delay.cache.set(0.5)
+    timer.source.cache.set("bus")
+    n_vals = 2 * len(dmm_driver.triggers)
+    monkeypatch.setattr(
+        dmm_driver, "ask", lambda cmd: ";".join(["0.1", "BOGUS"] * (n_vals // 2))
+    )
+
+    dmm_driver.snapshot_base(
+        update=True, params_to_skip_update=list(dmm_driver.parameters)
+    )
+
+    assert timer.delay.cache.get(get_if_invalid=False) == 0.5
+    assert timer.source.cache.get(get_if_invalid=False) == "bus"
+
+
+def test_snapshot_does_not_query_mode(dmm_driver, monkeypatch):
+    """
+    Test that a non-updating snapshot decides on input_impedance from the
+    cache only, without asking the instrument for its mode
+    """
+    dmm_driver.mode.cache.set("ac voltage")
+    dmm_driver.mode.cache.invalidate()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("mode was queried")
+
+    monkeypatch.setattr(dmm_driver.mode, "get_raw", fail)
+
+    dmm_driver.snapshot(update=False)
+
+    assert dmm_driver.input_impedance.snapshot_exclude
+
+
+def test_reset_restores_data_format(dmm_driver, monkeypatch):
+    """
+    Test that reset() selects the binary data format again, as *RST puts
+    the multimeter back to ASCII transfers
+    """
+    writes = []
+    write_raw = dmm_driver.write_raw
+
+    def record(cmd):
+        writes.append(cmd)
+        write_raw(cmd)
+
+    monkeypatch.setattr(dmm_driver, "write_raw", record)
+    dmm_driver.reset()
+
+    assert writes == ["*RST", "FORM:DATA REAL", "FORM:BORD SWAP"]
+    # nothing was left unanswered in the output buffer
+    assert dmm_driver.ask("*LANG?") == "SCPI"
+
+
+def test_snapshot_update_reads_mode(dmm_driver, monkeypatch):
+    """
+    Test that an updating snapshot decides on input_impedance from the mode
+    the instrument is in, not from a stale cached mode
+    """
+    dmm_driver.mode.cache.set("ac voltage")
+    dmm_driver.mode.cache.invalidate()
+    monkeypatch.setattr(dmm_driver, "_get_trigger_status", lambda: None)
+
+    dmm_driver.snapshot_base(
+        update=True, params_to_skip_update=list(dmm_driver.parameters)
+    )
+
+    assert dmm_driver.mode.get_latest() == "dc voltage"
+    assert not dmm_driver.input_impedance.snapshot_exclude
@@ -0,0 +1,148 @@
+"""
+Testing YokogawaGS820 driver with simulated instrument
+Run by navigating to tests folder and executing
+pytest test_sim_yokogawaGS820.py
+"""
+
+import pytest
+from qcodes.instrument import VisaInstrument
+
+from barreralabdrivers.drivers import YokogawaGS820
+
+
+# The following decorator makes the driver
+# available to all the functions in this module
+@pytest.fixture(scope="module", name="yoko_driver")
+def _yoko_driver():
+    yoko_sim = YokogawaGS820(
+        "yoko_sim",
+        address="GPIB::1::INSTR",
+        pyvisa_sim_file="barreralabdrivers.sims:YokogawaGS820.yaml",
+    )
+    yield yoko_sim
+
+    yoko_sim.close()
+
+
+# The simulator is loaded once per module, so put the
+# instrument back into its default state before every test
+@pytest.fixture(autouse=True)
+def _reset(yoko_driver):
+    yoko_driver.reset()
+
+
+@pytest.fixture(name="writes")
+def _writes(yoko_driver, monkeypatch):
+    """
+    Record the commands that reach the instrument instead of sending them.
+    The driver's own write_raw (and its buffering) still runs.
+    """
+    writes = []
+    monkeypatch.setattr(
+        VisaInstrument, "write_raw", lambda self, cmd: writes.append(cmd)
+    )
+    return writes
+
+
+@pytest.mark.parametrize("step", [-0.1, 0])
+def test_ramp_rejects_non_positive_step(yoko_driver, writes, step):
+    """
+    Test that a ramp with a non-positive step is refused before anything is
+    written, instead of jumping straight to the target
+    """
+    with pytest.raises(ValueError, match="step must be positive"):
+        yoko_driver.channel1.ramp_voltage(10.0, step, 0)
+
+    assert writes == []
+
+
+def test_ramp_steps(yoko_driver, writes):
+    yoko_driver.channel1.ramp_voltage(1.0, 0.5, 0)
+
+    assert writes == [
+        "channel1:SOUR:VOLT:LEV 5.00000e-01",
+        "channel1:SOUR:VOLT:LEV 1.00000e+00",
+    ]
+    assert yoko_driver.channel1.output_level.get_latest() == 1.0
+
+
+def test_async_writes_keep_order(yoko_driver, writes):
+    """
+    Test that buffered writes, display text included, are sent in order as
+    one compound command when the block ends
+    """
+    with yoko_driver.async_writes():
+        yoko_driver.channel1.voltage(0.5)
+        yoko_driver.display_settext("ramping")
+        assert writes == []
+
+    assert writes == [
+        ':channel1:SOUR:VOLT:LEV 5.00000e-01;:SYST:DISP:TEXT "ramping"'
+    ]
+
+
+def test_range_snaps_to_allowed_value(yoko_driver, writes):
+    """
+    Test that a range within rounding of an allowed one is sent as exactly
+    that range, so the instrument cannot pick the next larger one
+    """
+    chan = yoko_driver.channel1
+    chan.voltage_range(0.2 * (1 + 1e-12))
+
+    assert writes == ["channel1:SOUR:VOLT:RANGE 0.2"]
+    assert chan.voltage_range.cache.raw_value == 0.2
+    assert chan._read_cache["channel1:SOUR:VOLT:RANGE?"][1] == 0.2
+    with pytest.raises(ValueError):
+        chan.voltage_range(0.3)
+
+
+@pytest.mark.parametrize("step", [-0.1, 0])
+def test_ramp_many_rejects_non_positive_step(yoko_driver, writes, step):
+    ch1, ch2 = yoko_driver.channels
+    with pytest.raises(ValueError, match="step must be positive"):
+        yoko_driver.ramp_many([(ch1, 1.0), (ch2, 1e-3)], step, 0)
+
+    assert writes == []
+
+
+def test_ramp_many_steps(yoko_driver, writes):
+    """
+    Test that channels ramp together, one write per step, paced by the
+    longest ramp
+    """
+    ch1, ch2 = yoko_driver.channels
+    yoko_driver.ramp_many([(ch1, 1.0), (ch2, 1e-3)], 0.5, 0)
+
+    assert writes == [
+        "channel1:SOUR:VOLT:LEV 5.00000e-01;:channel2:SOUR:CURR:LEV 5.00000e-04",
+        "channel1:SOUR:VOLT:LEV 1.00000e+00;:channel2:SOUR:CURR:LEV 1.00000e-03",
+    ]
+
+
+def test_drain_errors(yoko_driver, monkeypatch):
+    chan = yoko_driver.channel1
+    replies = iter(['-113,"Undefined header";0,"No error"'])
+    monkeypatch.setattr(chan, "ask", lambda cmd: next(replies))
+
+    assert chan.drain_errors(batch=2) == ['-113,"Undefined header"']
+
+
+def test_drain_errors_gives_up(yoko_driver, monkeypatch, caplog):
+    """
+    Test that a queue which never reports empty is read a bounded number of
+    times instead of forever
+    """
+    chan = yoko_driver.channel1
+    queries = []
+
+    def ask(cmd):
+        queries.append(cmd)
+        return "garbage;garbage"
+
+    monkeypatch.setattr(chan, "ask", ask)
+
+    errors = chan.drain_errors(batch=2, max_queries=3)
+
+    assert len(queries) == 3
+    assert errors == ["garbage"] * 6
+    assert "error queue not empty" in caplog.text